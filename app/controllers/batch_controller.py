@@ -0,0 +1,43 @@
+from flask import Blueprint, request, jsonify
+from app.services.batch_service import BatchService
+
+batch_bp = Blueprint('batch', __name__, url_prefix='/api')
+
+@batch_bp.route('/batch', methods=['POST'])
+def execute_batch():
+    """
+    批量请求API，在一次请求内执行多个子请求
+    请求参数:
+    {
+        "requests": [
+            {
+                "id": "子请求标识",  # 可选，原样返回，默认为子请求序号
+                "method": "GET",  # 可选，GET/POST/PUT/DELETE，默认GET
+                "path": "/api/projects",  # 必填，可带查询字符串
+                "query": {"limit": 10},  # 可选，查询参数
+                "headers": {"If-None-Match": "..."},  # 可选，请求头
+                "body": {}  # 可选，JSON请求体
+            }
+        ],
+        "concurrent": false  # 可选，全部为GET请求时并发执行
+    }
+    返回:
+    {
+        "responses": [{"id": 子请求标识, "status": 状态码, "headers": {...}, "body": 响应体}]
+    }
+    """
+    data = request.get_json(silent=True)
+
+    try:
+        specs, concurrent = BatchService.parse(data)
+        responses = BatchService.execute(
+            specs,
+            concurrent=concurrent,
+            outer_headers=request.headers,
+            base_url=request.host_url
+        )
+        return jsonify({'responses': responses}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'批量请求失败: {str(e)}'}), 500
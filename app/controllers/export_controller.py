@@ -0,0 +1,49 @@
+from datetime import datetime
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from app.services.export_service import ExportService
+from app.models.project import Project, ProjectApplication
+from app.models.user import User
+from app.utils.fieldsets import parse_fields
+
+export_bp = Blueprint('export', __name__, url_prefix='/api')
+
+@export_bp.route('/export/<resource>', methods=['GET'])
+def export_data(resource):
+    """
+    导出项目/用户/项目申请API，以流式响应逐批输出，适用于数据分析等全量读取场景
+
+    路径参数:
+    - resource: projects、users 或 applications
+
+    请求参数 (URL查询参数):
+    - format: ndjson（默认，每行一个JSON对象）或 csv
+    - updated_since: 只导出该时间之后更新过的数据，如 2024-01-01 或 2024-01-01 08:00:00
+    - fields: 只导出的字段，多个用逗号分隔，id总是导出
+
+    客户端支持gzip（Accept-Encoding: gzip）时以gzip压缩输出
+    """
+    models = {'projects': Project, 'users': User, 'applications': ProjectApplication}
+    if resource not in models:
+        return jsonify({'error': f"不支持的导出数据: {resource}，可选值: {', '.join(models)}"}), 404
+
+    fmt = request.args.get('format', ExportService.FORMAT_NDJSON)
+    if fmt not in ExportService.FORMATS:
+        return jsonify({'error': f"不支持的导出格式，可选值: {', '.join(ExportService.FORMATS)}"}), 400
+
+    try:
+        updated_since = ExportService.parse_since(request.args.get('updated_since'))
+        fields = parse_fields(request.args, models[resource])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    gzip = bool(request.accept_encodings['gzip'])
+    chunks = ExportService.export(resource, fmt, updated_since=updated_since, fields=fields, gzip=gzip)
+
+    filename = f"{resource}-{datetime.now().strftime('%Y%m%d%H%M%S')}.{fmt}"
+    response = Response(stream_with_context(chunks), mimetype=ExportService.MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['Cache-Control'] = 'no-store'
+    response.vary.add('Accept-Encoding')
+    if gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
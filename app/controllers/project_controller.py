@@ -1,18 +1,52 @@
-from flask import Blueprint, request, jsonify, send_from_directory
-from app.services.project_service import ProjectService, SkillTypeService, ProjectApplicationService, ProjectDeliverableService, DeliverableConfirmationService
-from app.models.project import ProjectApplication
+from flask import Blueprint, request, jsonify, make_response, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+from app.services.project_service import ProjectService, SkillTypeService, ProjectApplicationService, ProjectDeliverableService, DeliverableConfirmationService, project_paginator, deliverable_paginator
+from app.services.file_storage import FileStorageService
+from app.services.thumbnail_service import ThumbnailService
+from app.services.project_cache import project_detail_cache
+from app.services.project_filters import ProjectFilterCompiler
+from app.utils.file_response import send_stored_file
+from app.utils.etag import weak_etag, request_args_fingerprint, conditional_response
+from app.utils.fieldsets import parse_fields
+from app.utils.statement_cache import statement_cache_stats
+from app.models.project import Project, ProjectApplication
 from datetime import datetime
 
 project_bp = Blueprint('project', __name__, url_prefix='/api')
 
+# 批量处理申请时单次最多处理的申请数
+BULK_MAX_APPLICATIONS = 200
+
+def _project_page_response(result):
+    """
+    组装分页后的项目列表响应
+    :param result: 项目列表服务返回的字典
+    """
+    response = {
+        'data': result['items'],
+        'next_cursor': result['next_cursor'],
+        'has_more': result['next_cursor'] is not None
+    }
+    if result['total'] is not None:
+        response['total'] = result['total']
+    return jsonify(response), 200
+
 @project_bp.route('/skill-types', methods=['GET'])
 def get_skill_types():
     """
     获取所有技能类型API
+    
+    支持条件请求：携带 If-None-Match 且技能类型未变化时返回304
     """
     try:
-        skill_types = SkillTypeService.get_all_skill_types()
-        return jsonify({'data': skill_types, 'total': len(skill_types)}), 200
+        skill_types, etag = SkillTypeService.get_all_skill_types_with_etag()
+        if etag in request.if_none_match:
+            response = make_response('', 304)
+        else:
+            response = make_response(jsonify({'data': skill_types, 'total': len(skill_types)}), 200)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         return jsonify({'error': f'获取技能类型失败: {str(e)}'}), 500
 
@@ -70,21 +104,9 @@ def create_project():
     
     # 验证技能需求数据
     if 'skill_requirements' in data:
-        for i, skill in enumerate(data['skill_requirements']):
-            required_skill_fields = ['skill_type_id', 'required_count', 'importance']
-            for field in required_skill_fields:
-                if field not in skill:
-                    return jsonify({'error': f'第{i+1}个技能需求缺少必填字段: {field}'}), 400
-            
-            # 验证重要程度是否在1-5范围
-            if not (1 <= skill['importance'] <= 5):
-                return jsonify({'error': f'第{i+1}个技能需求的重要程度必须在1-5之间'}), 400
-            
-            # 验证技能类型ID是否存在
-            try:
-                SkillTypeService.get_skill_type_by_id(skill['skill_type_id'])
-            except:
-                return jsonify({'error': f'第{i+1}个技能需求的技能类型ID不存在'}), 400
+        errors = SkillTypeService.validate_skill_requirements(data['skill_requirements'])
+        if errors:
+            return jsonify({'error': '；'.join(errors), 'errors': errors}), 400
     
     # 获取创建者ID
     user_id = data.get('user_id')
@@ -110,6 +132,13 @@ def get_project_list():
     - recruitment_status: 招募状态 (1-开放申请、2-招募结束)
     - skill_type_ids: 所需技能ID，多个用逗号分隔
     - keyword: 关键词搜索（搜索项目描述和目标）
+    - search_mode: 检索模式 (like、fulltext)，默认like
+    - limit: 每页数量，默认20，最大100
+    - cursor: 上一页响应中的 next_cursor
+    - sort: 排序字段 (created_at、updated_at、end_time、id、relevance)，默认created_at，relevance仅在全文检索时可用
+    - order: 排序方向 (asc、desc)，默认desc
+    - with_total: 为1时额外返回符合条件的总数
+    - fields: 只返回的字段，多个用逗号分隔（如 name,project_type,status），id总是返回
     """
     filters = {}
     
@@ -132,9 +161,21 @@ def get_project_list():
     if request.args.get('keyword'):
         filters['keyword'] = request.args.get('keyword')
     
+    if request.args.get('search_mode'):
+        filters['search_mode'] = request.args.get('search_mode')
+    
+    try:
+        pagination = project_paginator.parse_args(request.args)
+        fields = parse_fields(request.args, Project)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     try:
-        projects = ProjectService.get_project_list(filters)
-        return jsonify({'data': projects, 'total': len(projects)}), 200
+        # 先只查询列表版本，客户端缓存仍有效时返回304，不加载和序列化项目
+        etag = weak_etag('projects', request_args_fingerprint(), ProjectService.get_project_list_version(filters))
+        return conditional_response(etag, lambda: _project_page_response(ProjectService.get_project_list(filters, pagination, fields)))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'获取项目列表失败: {str(e)}'}), 500
 
@@ -153,6 +194,13 @@ def get_founder_projects():
     - recruitment_status: 招募状态 (1-开放申请、2-招募结束)
     - skill_type_ids: 所需技能ID，多个用逗号分隔
     - keyword: 关键词搜索（搜索项目描述和目标）
+    - search_mode: 检索模式 (like、fulltext)，默认like
+    - limit: 每页数量，默认20，最大100
+    - cursor: 上一页响应中的 next_cursor
+    - sort: 排序字段 (created_at、updated_at、end_time、id、relevance)，默认created_at，relevance仅在全文检索时可用
+    - order: 排序方向 (asc、desc)，默认desc
+    - with_total: 为1时额外返回符合条件的总数
+    - fields: 只返回的字段，多个用逗号分隔（如 name,project_type,status），id总是返回
     """
     # 从请求体获取 user_id
     user_id = request.args.get('user_id')
@@ -183,9 +231,20 @@ def get_founder_projects():
     if request.args.get('keyword'):
         filters['keyword'] = request.args.get('keyword')
     
+    if request.args.get('search_mode'):
+        filters['search_mode'] = request.args.get('search_mode')
+    
     try:
-        projects = ProjectService.get_founder_project_list(filters)
-        return jsonify({'data': projects, 'total': len(projects)}), 200
+        pagination = project_paginator.parse_args(request.args)
+        fields = parse_fields(request.args, Project)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        result = ProjectService.get_founder_project_list(filters, pagination, fields)
+        return _project_page_response(result)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'获取项目列表失败: {str(e)}'}), 500
 
@@ -204,6 +263,13 @@ def get_participant_projects():
     - recruitment_status: 招募状态 (1-开放申请、2-招募结束)
     - skill_type_ids: 所需技能ID，多个用逗号分隔
     - keyword: 关键词搜索（搜索项目描述和目标）
+    - search_mode: 检索模式 (like、fulltext)，默认like
+    - limit: 每页数量，默认20，最大100
+    - cursor: 上一页响应中的 next_cursor
+    - sort: 排序字段 (created_at、updated_at、end_time、id、relevance)，默认created_at，relevance仅在全文检索时可用
+    - order: 排序方向 (asc、desc)，默认desc
+    - with_total: 为1时额外返回符合条件的总数
+    - fields: 只返回的字段，多个用逗号分隔（如 name,project_type,status），id总是返回
     """
     # 从请求体获取 user_id
     user_id = request.args.get('user_id')
@@ -234,9 +300,20 @@ def get_participant_projects():
     if request.args.get('keyword'):
         filters['keyword'] = request.args.get('keyword')
     
+    if request.args.get('search_mode'):
+        filters['search_mode'] = request.args.get('search_mode')
+    
     try:
-        projects = ProjectService.get_participant_project_list(filters)
-        return jsonify({'data': projects, 'total': len(projects)}), 200
+        pagination = project_paginator.parse_args(request.args)
+        fields = parse_fields(request.args, Project)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        result = ProjectService.get_participant_project_list(filters, pagination, fields)
+        return _project_page_response(result)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'获取项目列表失败: {str(e)}'}), 500
 
@@ -255,6 +332,21 @@ def get_project_detail(project_id):
         return jsonify({'error': f'获取项目详情失败: {str(e)}'}), 500
 
 
+@project_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """
+    获取缓存命中统计API
+    """
+    try:
+        return jsonify({'data': {
+            'project_detail': project_detail_cache.stats(),
+            'project_filters': ProjectFilterCompiler.stats(),
+            'statement_cache': statement_cache_stats.stats()
+        }}), 200
+    except Exception as e:
+        return jsonify({'error': f'获取缓存统计失败: {str(e)}'}), 500
+
+
 @project_bp.route('/project-applications', methods=['POST'])
 def apply_for_project():
     """
@@ -323,6 +415,54 @@ def process_application(application_id):
         return jsonify({'error': f'处理申请失败: {str(e)}'}), 500
 
 
+@project_bp.route('/project-applications/bulk', methods=['PUT'])
+def process_applications_bulk():
+    """
+    批量处理项目申请API
+    请求参数:
+    {
+        "application_ids": [申请ID, ...],  # 必填，最多200个
+        "status": 状态码(2-接受, 3-拒绝),
+        "response_message": "回复消息",  # 可选，所有申请使用同一回复
+        "user_id": "处理人ID"  # 必填，必须是项目负责人
+    }
+    """
+    data = request.get_json()
+
+    # 参数验证
+    application_ids = data.get('application_ids')
+    if not isinstance(application_ids, list) or not application_ids:
+        return jsonify({'error': 'application_ids必须为非空的申请ID列表'}), 400
+
+    if len(application_ids) > BULK_MAX_APPLICATIONS:
+        return jsonify({'error': f'单次最多处理{BULK_MAX_APPLICATIONS}个申请'}), 400
+
+    if not all(isinstance(application_id, int) and not isinstance(application_id, bool) for application_id in application_ids):
+        return jsonify({'error': 'application_ids必须为整数列表'}), 400
+
+    if 'status' not in data:
+        return jsonify({'error': '缺少必填字段: status'}), 400
+
+    if data['status'] not in [ProjectApplication.STATUS_APPROVED, ProjectApplication.STATUS_REJECTED]:
+        return jsonify({'error': '状态码无效，必须为2(接受)或3(拒绝)'}), 400
+
+    if 'user_id' not in data:
+        return jsonify({'error': '缺少必填字段: user_id'}), 400
+
+    try:
+        results, summary = ProjectApplicationService.process_applications_bulk(
+            application_ids,
+            data['status'],
+            data.get('response_message'),
+            data['user_id']
+        )
+        return jsonify({'message': '申请批量处理完成', 'data': results, 'summary': summary}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'批量处理申请失败: {str(e)}'}), 500
+
+
 @project_bp.route('/my-applications', methods=['GET'])
 def get_my_applications():
     """
@@ -337,8 +477,13 @@ def get_my_applications():
         return jsonify({'error': '缺少必填参数: user_id'}), 400
     
     try:
-        applications = ProjectApplicationService.get_my_applications(user_id)
-        return jsonify({'data': applications, 'total': len(applications)}), 200
+        etag = weak_etag('my-applications', user_id, ProjectApplicationService.get_my_applications_version(user_id))
+
+        def build():
+            applications = ProjectApplicationService.get_my_applications(user_id)
+            return jsonify({'data': applications, 'total': len(applications)}), 200
+
+        return conditional_response(etag, build)
     except Exception as e:
         return jsonify({'error': f'获取申请列表失败: {str(e)}'}), 500
 
@@ -352,8 +497,16 @@ def get_project_applications(project_id):
     - user_id: 当前用户ID (可选，不再用于权限验证)
     """
     try:
-        applications = ProjectApplicationService.get_project_applications(project_id)
-        return jsonify({'data': applications, 'total': len(applications)}), 200
+        version = ProjectApplicationService.get_project_applications_version(project_id)
+        if version is None:
+            return jsonify({'error': '项目不存在'}), 404
+        etag = weak_etag('project-applications', project_id, version)
+        
+        def build():
+            applications = ProjectApplicationService.get_project_applications(project_id)
+            return jsonify({'data': applications, 'total': len(applications)}), 200
+        
+        return conditional_response(etag, build)
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
     except Exception as e:
@@ -436,24 +589,9 @@ def update_project(project_id):
     
     # 验证技能需求数据
     if 'skill_requirements' in data:
-        if not isinstance(data['skill_requirements'], list):
-            return jsonify({'error': 'skill_requirements必须是数组'}), 400
-            
-        for i, skill in enumerate(data['skill_requirements']):
-            required_skill_fields = ['skill_type_id', 'required_count', 'importance']
-            for field in required_skill_fields:
-                if field not in skill:
-                    return jsonify({'error': f'第{i+1}个技能需求缺少必填字段: {field}'}), 400
-            
-            # 验证重要程度是否在1-5范围
-            if not (1 <= skill['importance'] <= 5):
-                return jsonify({'error': f'第{i+1}个技能需求的重要程度必须在1-5之间'}), 400
-            
-            # 验证技能类型ID是否存在
-            try:
-                SkillTypeService.get_skill_type_by_id(skill['skill_type_id'])
-            except:
-                return jsonify({'error': f'第{i+1}个技能需求的技能类型ID不存在'}), 400
+        errors = SkillTypeService.validate_skill_requirements(data['skill_requirements'])
+        if errors:
+            return jsonify({'error': '；'.join(errors), 'errors': errors}), 400
     
     try:
         project = ProjectService.update_project(project_id, data, data['user_id'])
@@ -494,17 +632,34 @@ def delete_project():
 def get_project_deliverables():
     """
     获取项目交付物列表，支持返回当前用户确认状态
+    
+    请求参数 (URL查询参数):
+    - project_id: 项目ID
+    - user_id: 用户ID (可选，带上时返回该用户对每个交付物的确认状态 confirmed)
+    - status: 交付物状态筛选 (0-草稿、1-已提交、2-已审核，可选)
+    - limit / cursor / sort / order / with_total: 游标分页参数 (可选，不传 limit 和 cursor 时返回全部)
     """
     project_id = request.args.get('project_id')
     user_id = request.args.get('user_id')
+    status = None
+    if request.args.get('status'):
+        status = request.args.get('status', type=int)
+        if status is None:
+            return jsonify({'error': 'status参数必须为整数'}), 400
+    
     try:
-        deliverables = ProjectDeliverableService.get_deliverables_by_project(project_id)
-        # 如果带 user_id，补充确认状态
-        if user_id:
-            for d in deliverables:
-                status = DeliverableConfirmationService.get_deliverable_confirm_status(d['id'], user_id)
-                d['confirmed'] = status.get('confirmed', False)
-        return jsonify({'data': deliverables, 'total': len(deliverables)}), 200
+        pagination = None
+        if request.args.get('limit') or request.args.get('cursor'):
+            pagination = deliverable_paginator.parse_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        result = ProjectDeliverableService.get_deliverables_by_project(project_id, user_id, status, pagination)
+        response = {'data': result['items'], 'next_cursor': result['next_cursor']}
+        if result['total'] is not None:
+            response['total'] = result['total']
+        return jsonify(response), 200
     except Exception as e:
         return jsonify({'error': f'获取交付物失败: {str(e)}'}), 500
 
@@ -530,6 +685,10 @@ def upload_project_deliverable():
         file = request.files.get('file')
         deliverable = ProjectDeliverableService.create_deliverable(project_id, data, uploader_id, file)
         return jsonify({'message': '交付物上传成功', 'data': deliverable.to_dict()}), 200
+    except RequestEntityTooLarge:
+        return jsonify({'error': f"上传文件过大，最大允许 {current_app.config['DELIVERABLE_MAX_UPLOAD_SIZE']} 字节"}), 413
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'上传交付物失败: {str(e)}'}), 500
 
@@ -562,10 +721,8 @@ def update_deliverable_status():
     if 'status' not in data:
         return jsonify({'error': '缺少必填字段: status'}), 400
     try:
+        # 审核通过时由后台任务检查项目是否可标记为已完成
         deliverable = ProjectDeliverableService.update_status(deliverable_id, data['status'], data.get('reviewer_id'))
-        # 若为审核通过，自动检查项目是否可标记为已完成
-        if data['status'] == 2:
-            ProjectDeliverableService.check_and_complete_project(deliverable.project_id)
         return jsonify({'message': '交付物状态更新成功', 'data': deliverable.to_dict()}), 200
     except Exception as e:
         return jsonify({'error': f'更新交付物状态失败: {str(e)}'}), 500
@@ -574,11 +731,45 @@ def update_deliverable_status():
 def get_deliverable_file():
     """
     下载交付物文件
+    
+    请求参数 (URL查询参数):
+    - deliverable_id: 交付物ID（按内容寻址存储的文件）
+    - variant: 可选，thumb（缩略图）或 preview（WebP预览图），仅对图片交付物有效
+    - project_id, filename: 旧版按项目目录存储的文件
     """
+    variant = request.args.get('variant')
+    if variant and variant not in ThumbnailService.VARIANTS:
+        return jsonify({'error': f"variant参数无效，可选值: {', '.join(ThumbnailService.VARIANTS)}"}), 400
+    
+    deliverable_id = request.args.get('deliverable_id', type=int)
+    if deliverable_id:
+        deliverable = ProjectDeliverableService.get_deliverable_by_id(deliverable_id)
+        if not deliverable:
+            return jsonify({'error': '交付物文件不存在'}), 404
+        variant_path = getattr(deliverable, ThumbnailService.VARIANTS[variant][2]) if variant else None
+        if variant_path:
+            return send_stored_file(
+                FileStorageService.storage_root(),
+                variant_path,
+                etag=f'{deliverable.file_hash}.{variant}' if deliverable.file_hash else None,
+                immutable=bool(deliverable.file_hash)
+            )
+        if not deliverable.stored_file:
+            return jsonify({'error': '交付物文件不存在'}), 404
+        # 缩略图尚未生成时返回原文件，此时不能长期缓存
+        return send_stored_file(
+            FileStorageService.storage_root(),
+            deliverable.stored_file.storage_path,
+            etag=deliverable.file_hash,
+            immutable=not variant,
+            download_name=deliverable.file_name or None
+        )
+    
     project_id = request.args.get('project_id')
     filename = request.args.get('filename')
-    project_id = str(project_id)
-    return send_from_directory(f'static/deliverables/{project_id}',filename)
+    if not project_id or not filename:
+        return jsonify({'error': '缺少必要参数: deliverable_id 或 project_id、filename'}), 400
+    return send_stored_file(FileStorageService.storage_root(), f'{project_id}/{filename}', download_name=filename)
 
 @project_bp.route('/deliverables', methods=['GET'])
 def get_deliverable_detail():
@@ -605,9 +796,8 @@ def confirm_deliverable():
     if not user_id:
         return jsonify({'error': '缺少必填参数: user_id'}), 400
     try:
+        # 确认交付物；项目是否可自动完成由提交后执行的后台任务检查
         confirmation = DeliverableConfirmationService.confirm_deliverable(deliverable_id, user_id)
-        # 检查项目是否可自动完成
-        DeliverableConfirmationService.check_and_complete_project_by_confirmation(confirmation.project_id)
         return jsonify({'message': '交付物确认成功', 'data': confirmation.to_dict()}), 200
     except ValueError as e:
         return jsonify({'error': str(e)}), 403
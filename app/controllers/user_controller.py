@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify
 from app.services.user_service import UserService
+from app.services.user_import import UserImportService
+from app.models.user import User
+from app.utils.fieldsets import parse_fields
 
 user_bp = Blueprint('user', __name__, url_prefix='/api')
 
@@ -39,6 +42,45 @@ def create_user():
     except Exception as e:
         return jsonify({'error': f'创建用户失败: {str(e)}'}), 500
 
+@user_bp.route('/users/import', methods=['POST'])
+def import_users():
+    """
+    批量导入用户API
+
+    请求体为 CSV（表头为用户字段）或 NDJSON（每行一个用户JSON对象）文件内容，
+    也可以 multipart/form-data 上传，文件字段名为 file。文件逐行读取，不会整体载入内存。
+
+    查询参数:
+    - format: csv 或 ndjson，默认按文件扩展名或 Content-Type（text/csv、application/x-ndjson）判断
+    - batch_size: 每批插入的行数，默认500
+    - dry_run: 为1时只校验不写入
+    """
+    fmt = request.args.get('format')
+    dry_run = request.args.get('dry_run') == '1'
+    batch_size = request.args.get('batch_size', type=int)
+    if batch_size is not None and batch_size <= 0:
+        return jsonify({'error': 'batch_size必须为正整数'}), 400
+
+    if request.mimetype == 'multipart/form-data':
+        file = request.files.get('file')
+        if file is None:
+            return jsonify({'error': '缺少上传文件: file'}), 400
+        stream = file.stream
+        fmt = fmt or UserImportService.detect_format(file.filename, file.mimetype)
+    else:
+        stream = request.stream
+        fmt = fmt or UserImportService.detect_format(mimetype=request.mimetype)
+    if fmt is None:
+        return jsonify({'error': '无法判断导入格式，请通过format参数指定csv或ndjson'}), 400
+
+    try:
+        report = UserImportService.import_stream(stream, fmt, batch_size=batch_size, dry_run=dry_run)
+        return jsonify({'message': '用户导入完成', 'data': report}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'导入用户失败: {str(e)}'}), 500
+
 @user_bp.route('/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
     """
@@ -82,6 +124,7 @@ def get_user_list():
     - star_sign: 星座
     - major: 专业
     - user_id: Auth0用户标识
+    - fields: 只返回的字段，多个用逗号分隔（如 full_name,picture,major），id总是返回
     """
     filters = {}
     
@@ -108,7 +151,12 @@ def get_user_list():
         filters['user_id'] = request.args.get('user_id')
     
     try:
-        users = UserService.get_user_list(filters)
+        fields = parse_fields(request.args, User)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        users = UserService.get_user_list(filters, fields)
         return jsonify({'data': users, 'total': len(users)}), 200
     except Exception as e:
         return jsonify({'error': f'获取用户列表失败: {str(e)}'}), 500 
@@ -127,6 +175,7 @@ def get_participant_user_list():
     - star_sign: 星座
     - major: 专业
     - user_id: Auth0用户标识
+    - fields: 只返回的字段，多个用逗号分隔，可包含 project_name、project_skill，id总是返回
     """
     filters = {}
     if request.args.get('project_id'):
@@ -154,7 +203,12 @@ def get_participant_user_list():
         filters['user_id'] = request.args.get('user_id')
     
     try:
-        users = UserService.get_participant_user_list(filters)
+        fields = parse_fields(request.args, User, UserService.PARTICIPANT_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        users = UserService.get_participant_user_list(filters, fields)
         return jsonify({'data': users, 'total': len(users)}), 200
     except Exception as e:
         return jsonify({'error': f'获取用户列表失败: {str(e)}'}), 500 
\ No newline at end of file
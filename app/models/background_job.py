@@ -0,0 +1,56 @@
+from app import db
+from datetime import datetime
+import json
+from app.utils.serialization import format_datetime
+
+class BackgroundJob(db.Model):
+    """后台任务模型（持久化任务队列）"""
+    __tablename__ = 'background_jobs'
+
+    STATUS_PENDING = 0    # 待执行
+    STATUS_RUNNING = 1    # 执行中
+    STATUS_DONE = 2       # 已完成
+    STATUS_FAILED = 3     # 重试次数用尽
+
+    __table_args__ = (
+        db.Index('idx_background_jobs_status_run_at', 'status', 'run_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False, comment='任务类型')
+    payload = db.Column(db.Text, nullable=True, comment='任务参数，存储为JSON')
+    dedupe_key = db.Column(db.String(191), nullable=True, unique=True, comment='去重键，同一键同时只存在一个未完成任务')
+    status = db.Column(db.Integer, nullable=False, default=STATUS_PENDING, comment='任务状态：0-待执行，1-执行中，2-已完成，3-失败')
+    attempts = db.Column(db.Integer, nullable=False, default=0, comment='已执行次数')
+    max_attempts = db.Column(db.Integer, nullable=False, default=5, comment='最大执行次数')
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.now, comment='最早执行时间')
+    locked_at = db.Column(db.DateTime, nullable=True, comment='开始执行时间')
+    locked_by = db.Column(db.String(100), nullable=True, comment='执行者标识')
+    last_error = db.Column(db.Text, nullable=True, comment='最近一次错误信息')
+    created_at = db.Column(db.DateTime, default=datetime.now, comment='创建时间')
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, comment='更新时间')
+
+    def set_payload(self, payload):
+        """设置任务参数，接受字典"""
+        self.payload = json.dumps(payload or {}, ensure_ascii=False)
+
+    def get_payload(self):
+        """获取任务参数"""
+        if self.payload:
+            return json.loads(self.payload)
+        return {}
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'payload': self.get_payload(),
+            'dedupe_key': self.dedupe_key,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'run_at': format_datetime(self.run_at),
+            'last_error': self.last_error,
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at),
+        }
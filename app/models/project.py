@@ -1,5 +1,7 @@
 from app import db
 from datetime import datetime
+from app.utils.database import supports_window_functions
+from app.utils.serialization import format_datetime
 
 class SkillType(db.Model):
     """技能类型模型"""
@@ -17,8 +19,8 @@ class SkillType(db.Model):
             'id': self.id,
             'name': self.name,
             'description': self.description,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S')
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at)
         }
 
 class Project(db.Model):
@@ -43,49 +45,83 @@ class Project(db.Model):
     recruitment_status = db.Column(db.Integer, default=RECRUITMENT_OPEN, comment='招募状态：1-开放申请、2-招募结束')
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    # 每次更新加一，与 updated_at 一起用于列表ETag（updated_at 只精确到秒）
+    row_version = db.Column(db.Integer, nullable=False, default=1, server_default='1',
+                            onupdate=db.literal_column('row_version + 1'), comment='行版本号')
     
     # 创建者Auth0标识，现在添加外键约束
     user_id = db.Column(db.String(100), db.ForeignKey('users.user_id'), nullable=False, comment='创建者Auth0用户标识')
     
+    __table_args__ = (
+        # 项目列表按状态、招募状态、类型筛选
+        db.Index('idx_projects_status_recruitment_type', 'status', 'recruitment_status', 'project_type'),
+        # 我创建的项目
+        db.Index('idx_projects_user_id', 'user_id'),
+        # 全文索引（仅MySQL），使用ngram分词以同时支持中英文检索
+        db.Index('ft_projects_name', 'name', mysql_prefix='FULLTEXT', mysql_with_parser='ngram').ddl_if(dialect='mysql'),
+        db.Index('ft_projects_content', 'description', 'goal', mysql_prefix='FULLTEXT', mysql_with_parser='ngram').ddl_if(dialect='mysql'),
+    )
+    
     # 建立与SkillRequirement的一对多关系
     skill_requirements = db.relationship('SkillRequirement', backref='project', lazy=True, cascade='all, delete-orphan')
     
     # 建立与ProjectApplication的一对多关系
     applications = db.relationship('ProjectApplication', backref='project', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
-        """转换为字典"""
-        creator_info = None
-        if self.creator:
-            creator_info = {
-                'user_id': self.creator.user_id,
-                'picture': self.creator.picture,
-                'full_name': self.creator.full_name,
-                'major': self.creator.major,
-                'year_of_study': self.creator.year_of_study
-            }
+    # 项目详情中展示的最近参与者数量
+    RECENT_PARTICIPANT_LIMIT = 5
+    
+    # 列表接口 fields 参数可选的输出字段（按输出顺序）及各字段依赖的列
+    FIELD_COLUMNS = {
+        'id': (),
+        'name': ('name',),
+        'project_type': ('project_type',),
+        'end_time': ('end_time',),
+        'description': ('description',),
+        'goal': ('goal',),
+        'status': ('status',),
+        'status_text': ('status',),
+        'recruitment_status': ('recruitment_status',),
+        'recruitment_status_text': ('recruitment_status',),
+        'user_id': ('user_id',),
+        'creator_info': ('user_id',),
+        'recent_participants': (),
+        'skill_requirements': (),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',)
+    }
+    
+    def _creator_info(self):
+        """创建者简要信息"""
+        if not self.creator:
+            return None
+        return {
+            'user_id': self.creator.user_id,
+            'picture': self.creator.picture,
+            'full_name': self.creator.full_name,
+            'major': self.creator.major,
+            'year_of_study': self.creator.year_of_study
+        }
+    
+    def to_dict(self, include_recent_participants=True, recent_participants=None):
+        """
+        转换为字典（单个项目；列表接口使用 ListReader）
+        :param include_recent_participants: 是否包含最近参与者信息
+        :param recent_participants: 预先批量查询好的最近参与者列表，为None时单独查询
+        """
+        creator_info = self._creator_info()
             
         # 获取最近5个参与者信息
-        recent_participants = []
-        approved_applications = ProjectApplication.query.filter_by(
-            project_id=self.id, 
-            status=ProjectApplication.STATUS_PENDING
-        ).order_by(ProjectApplication.updated_at.desc()).limit(5).all()
-        
-        for app in approved_applications:
-            if app.applicant:
-                participant_info = {
-                    'user_id': app.applicant.user_id,
-                    'picture': app.applicant.picture,
-                    'full_name': app.applicant.full_name
-                }
-                recent_participants.append(participant_info)
+        if include_recent_participants and recent_participants is None:
+            recent_participants = ProjectApplication.get_recent_participants(
+                [self.id], self.RECENT_PARTICIPANT_LIMIT
+            ).get(self.id, [])
             
-        return {
+        data = {
             'id': self.id,
             'name': self.name,
             'project_type': self.project_type,
-            'end_time': self.end_time.strftime('%Y-%m-%d %H:%M:%S'),
+            'end_time': format_datetime(self.end_time),
             'description': self.description,
             'goal': self.goal,
             'status': self.status,
@@ -96,9 +132,12 @@ class Project(db.Model):
             'creator_info': creator_info,
             'recent_participants': recent_participants,
             'skill_requirements': [skill.to_dict() for skill in self.skill_requirements],
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S')
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at)
         }
+        if not include_recent_participants:
+            del data['recent_participants']
+        return data
 
 
 class SkillRequirement(db.Model):
@@ -139,6 +178,13 @@ class ProjectApplication(db.Model):
     STATUS_APPROVED = 2   # 已接受
     STATUS_REJECTED = 3   # 已拒绝
     
+    __table_args__ = (
+        # 项目的申请/参与者列表（按状态筛选、按更新时间取最近参与者）
+        db.Index('idx_project_applications_project_status_updated', 'project_id', 'status', 'updated_at'),
+        # 我的申请、我参与的项目
+        db.Index('idx_project_applications_user_status', 'user_id', 'status'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, comment='项目ID')
     user_id = db.Column(db.String(100), db.ForeignKey('users.user_id'), nullable=False, comment='申请者ID')
@@ -148,18 +194,92 @@ class ProjectApplication(db.Model):
     response_message = db.Column(db.Text, nullable=True, comment='回复消息')
     created_at = db.Column(db.DateTime, default=datetime.now, comment='申请时间')
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, comment='更新时间')
+    # 每次更新加一，与 updated_at 一起用于列表ETag（updated_at 只精确到秒）
+    row_version = db.Column(db.Integer, nullable=False, default=1, server_default='1',
+                            onupdate=db.literal_column('row_version + 1'), comment='行版本号')
     
     # 关联关系
     applicant = db.relationship('User', backref='applications', foreign_keys=[user_id])
     skill_type = db.relationship('SkillType')
     
+    # 导出接口 fields 参数可选的输出字段（按输出顺序）及各字段依赖的列
+    FIELD_COLUMNS = {
+        'id': (),
+        'project_id': ('project_id',),
+        'user_id': ('user_id',),
+        'skill_type_id': ('skill_type_id',),
+        'skill_type_name': ('skill_type_id',),
+        'message': ('message',),
+        'status': ('status',),
+        'status_text': ('status',),
+        'response_message': ('response_message',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',)
+    }
+    
+    STATUS_TEXT = {
+        STATUS_PENDING: 'Pending',
+        STATUS_APPROVED: 'Approved',
+        STATUS_REJECTED: 'Rejected'
+    }
+    
+    @classmethod
+    def get_recent_participants(cls, project_ids, limit):
+        """
+        批量获取多个项目的最近参与者（已接受的申请者）
+        
+        使用 ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY updated_at DESC)
+        一次查询取出所有项目的前N个参与者；数据库不支持窗口函数时，
+        退化为一次按项目排序的查询并在内存中截取。
+        :param project_ids: 项目ID列表
+        :param limit: 每个项目返回的参与者数量
+        :return: 项目ID -> 参与者信息列表 的字典
+        """
+        from app.models.user import User
+        
+        if not project_ids:
+            return {}
+        
+        if supports_window_functions():
+            ranked = db.session.query(
+                cls.project_id.label('project_id'),
+                cls.user_id.label('user_id'),
+                db.func.row_number().over(
+                    partition_by=cls.project_id,
+                    order_by=(cls.updated_at.desc(), cls.id.desc())
+                ).label('row_number')
+            ).filter(
+                cls.project_id.in_(project_ids),
+                cls.status == cls.STATUS_APPROVED
+            ).subquery()
+            
+            rows = db.session.query(
+                ranked.c.project_id, User.user_id, User.picture, User.full_name
+            ).join(User, User.user_id == ranked.c.user_id).filter(
+                ranked.c.row_number <= limit
+            ).order_by(ranked.c.project_id, ranked.c.row_number).all()
+        else:
+            rows = db.session.query(
+                cls.project_id, User.user_id, User.picture, User.full_name
+            ).join(User, User.user_id == cls.user_id).filter(
+                cls.project_id.in_(project_ids),
+                cls.status == cls.STATUS_APPROVED
+            ).order_by(cls.project_id, cls.updated_at.desc(), cls.id.desc()).all()
+        
+        result = {}
+        for project_id, user_id, picture, full_name in rows:
+            participants = result.setdefault(project_id, [])
+            if len(participants) < limit:
+                participants.append({
+                    'user_id': user_id,
+                    'picture': picture,
+                    'full_name': full_name
+                })
+        return result
+    
     def to_dict(self):
         """转换为字典"""
-        status_text = {
-            self.STATUS_PENDING: 'Pending',
-            self.STATUS_APPROVED: 'Approved',
-            self.STATUS_REJECTED: 'Rejected'
-        }.get(self.status, 'Unknown status')
+        status_text = self.STATUS_TEXT.get(self.status, 'Unknown status')
         
             
         # 项目信息包含项目负责人信息
@@ -191,8 +311,8 @@ class ProjectApplication(db.Model):
             'status': self.status,
             'status_text': status_text,
             'response_message': self.response_message,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at),
             'project_info': project_info,
             'creator_info': creator_info
         } 
@@ -205,6 +325,11 @@ class ProjectDeliverable(db.Model):
     STATUS_SUBMITTED = 1  # 已提交
     STATUS_REVIEWED = 2   # 已审核
 
+    __table_args__ = (
+        # 项目的交付物列表（按创建时间分页）
+        db.Index('idx_project_deliverables_project_created', 'project_id', 'created_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, comment='项目ID')
     uploader_id = db.Column(db.String(100), db.ForeignKey('users.user_id'), nullable=False, comment='上传者ID')
@@ -213,6 +338,9 @@ class ProjectDeliverable(db.Model):
     file_name = db.Column(db.String(255), comment='文件名')
     file_size = db.Column(db.Integer, comment='文件大小（字节）')
     link_url = db.Column(db.String(255), comment='外部链接（如为URL导入）')
+    file_hash = db.Column(db.String(64), db.ForeignKey('stored_files.sha256'), nullable=True, comment='文件内容SHA-256')
+    thumbnail_path = db.Column(db.String(255), nullable=True, comment='缩略图路径（相对于存储根目录）')
+    preview_path = db.Column(db.String(255), nullable=True, comment='WebP预览图路径（相对于存储根目录）')
     status = db.Column(db.Integer, default=STATUS_DRAFT, comment='交付物状态：0-草稿，1-已提交，2-已审核')
     created_at = db.Column(db.DateTime, default=datetime.now, comment='创建时间')
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, comment='更新时间')
@@ -220,6 +348,11 @@ class ProjectDeliverable(db.Model):
     # 关联关系
     project = db.relationship('Project', backref='deliverables', lazy=True)
     uploader = db.relationship('User', backref='uploaded_deliverables', lazy=True)
+    stored_file = db.relationship('StoredFile', lazy=True)
+
+    def variant_url(self, variant):
+        """缩略图/预览图的下载地址"""
+        return f'/api/static/deliverables?deliverable_id={self.id}&variant={variant}'
 
     def to_dict(self):
         return {
@@ -231,15 +364,32 @@ class ProjectDeliverable(db.Model):
             'file_name': self.file_name,
             'file_size': self.file_size,
             'link_url': self.link_url,
+            'file_hash': self.file_hash,
+            'thumbnail_url': self.variant_url('thumb') if self.thumbnail_path else None,
+            'preview_url': self.variant_url('preview') if self.preview_path else None,
             'status': self.status,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at),
         } 
 
+class StoredFile(db.Model):
+    """按内容寻址存储的文件，相同内容只存一份，通过引用计数管理生命周期"""
+    __tablename__ = 'stored_files'
+
+    sha256 = db.Column(db.String(64), primary_key=True, comment='文件内容SHA-256')
+    size = db.Column(db.BigInteger, nullable=False, comment='文件大小（字节）')
+    storage_path = db.Column(db.String(255), nullable=False, comment='相对于存储根目录的路径')
+    ref_count = db.Column(db.Integer, nullable=False, default=1, comment='引用计数')
+    created_at = db.Column(db.DateTime, default=datetime.now, comment='创建时间')
+
 class DeliverableConfirmation(db.Model):
     """交付物确认模型"""
     __tablename__ = 'deliverable_confirmations'
 
+    __table_args__ = (
+        db.UniqueConstraint('deliverable_id', 'user_id', name='uq_deliverable_user'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, comment='项目ID')
     deliverable_id = db.Column(db.Integer, db.ForeignKey('project_deliverables.id'), nullable=False, comment='交付物ID')
@@ -259,5 +409,37 @@ class DeliverableConfirmation(db.Model):
             'deliverable_id': self.deliverable_id,
             'user_id': self.user_id,
             'confirmed': self.confirmed,
-            'confirmed_at': self.confirmed_at.strftime('%Y-%m-%d %H:%M:%S') if self.confirmed_at else None
-        } 
\ No newline at end of file
+            'confirmed_at': format_datetime(self.confirmed_at)
+        } 
+
+class ProjectProgress(db.Model):
+    """项目进度计数模型，随业务操作在同一事务内增量维护"""
+    __tablename__ = 'project_progress'
+
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True, comment='项目ID')
+    reviewed_deliverables = db.Column(db.Integer, nullable=False, default=0, comment='已审核交付物数')
+    participants = db.Column(db.Integer, nullable=False, default=0, comment='参与者数（已接受申请的用户，去重）')
+    confirmations_received = db.Column(db.Integer, nullable=False, default=0, comment='参与者对已审核交付物的确认数')
+    pending_applications = db.Column(db.Integer, nullable=False, default=0, comment='待处理申请数')
+    approved_applications = db.Column(db.Integer, nullable=False, default=0, comment='已接受申请数')
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, comment='更新时间')
+
+    COUNTER_FIELDS = ('reviewed_deliverables', 'participants', 'confirmations_received',
+                      'pending_applications', 'approved_applications')
+
+    @property
+    def expected_confirmations(self):
+        """所有参与者确认所有已审核交付物所需的确认数"""
+        return self.reviewed_deliverables * self.participants
+
+    def to_dict(self):
+        return {
+            'project_id': self.project_id,
+            'reviewed_deliverables': self.reviewed_deliverables,
+            'participants': self.participants,
+            'confirmations_received': self.confirmations_received,
+            'expected_confirmations': self.expected_confirmations,
+            'pending_applications': self.pending_applications,
+            'approved_applications': self.approved_applications,
+            'updated_at': format_datetime(self.updated_at)
+        }
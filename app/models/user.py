@@ -1,6 +1,7 @@
 from app import db
 from datetime import datetime
 import json
+from app.utils.serialization import format_datetime
 
 class User(db.Model):
     """用户模型"""
@@ -26,6 +27,26 @@ class User(db.Model):
     # 建立与项目的一对多关系
     projects = db.relationship('Project', backref='creator', lazy=True)
     
+    # 列表接口 fields 参数可选的输出字段（按输出顺序）及各字段依赖的列
+    FIELD_COLUMNS = {
+        'id': (),
+        'email': ('email',),
+        'full_name': ('full_name',),
+        'gender': ('gender',),
+        'mbti': ('mbti',),
+        'star_sign': ('star_sign',),
+        'skills': ('skills',),
+        'interests': ('interests',),
+        'year_of_study': ('year_of_study',),
+        'major': ('major',),
+        'key_factors': ('key_factors',),
+        'lightning_answers': ('lightning_answers',),
+        'picture': ('picture',),
+        'user_id': ('user_id',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',)
+    }
+    
     def set_key_factors(self, key_factors):
         """设置关键因素，接受字典或字符串"""
         if isinstance(key_factors, dict):
@@ -58,8 +79,23 @@ class User(db.Model):
                 return {}
         return {}
     
-    def to_dict(self):
-        """转换为字典"""
+    def to_dict(self, fields=None):
+        """
+        转换为字典
+        :param fields: 只输出的字段（见 FIELD_COLUMNS），为None时输出全部字段；未输出的列不会被访问
+        """
+        if fields is not None:
+            data = {}
+            for field in fields:
+                if field == 'key_factors':
+                    data[field] = self.get_key_factors()
+                elif field == 'lightning_answers':
+                    data[field] = self.get_lightning_answers()
+                elif field in ('created_at', 'updated_at'):
+                    data[field] = format_datetime(getattr(self, field))
+                else:
+                    data[field] = getattr(self, field)
+            return data
         return {
             'id': self.id,
             'email': self.email,
@@ -75,6 +111,6 @@ class User(db.Model):
             'lightning_answers': self.get_lightning_answers(),
             'picture': self.picture,
             'user_id': self.user_id,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S')
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at)
         } 
\ No newline at end of file
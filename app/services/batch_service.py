@@ -0,0 +1,169 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.test import EnvironBuilder
+from app import db
+
+
+class BatchService:
+    """
+    批量请求：在一次HTTP请求内依次执行多个子请求并汇总响应
+
+    子请求不经过网络，而是为每个子请求构造WSGI环境后在当前进程内走完整的Flask分发流程
+    （路由、before/after_request、错误处理），与单独请求的结果一致。
+    - 顺序执行时所有子请求共用当前的应用上下文和数据库会话（连接），每个子请求仍按各自接口的逻辑提交；
+    - 所有子请求都是只读的 GET 请求且要求并发时，由线程池并发执行，每个线程使用独立的应用上下文和数据库会话。
+    """
+
+    DEFAULT_MAX_REQUESTS = 20
+    DEFAULT_WORKERS = 4
+
+    ALLOWED_METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+    READ_METHODS = ('GET',)
+    # 子请求沿用外层请求的这些请求头（如认证信息），子请求中指定的同名请求头优先
+    INHERITED_HEADERS = ('Authorization', 'Cookie', 'Accept-Language')
+    # 不返回给调用方的子响应头
+    EXCLUDED_RESPONSE_HEADERS = ('Content-Length',)
+
+    _executor = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def parse(payload, max_requests=None):
+        """
+        校验批量请求体
+        :param payload: 请求体，{"requests": [{"id", "method", "path", "query", "headers", "body"}], "concurrent": bool}
+        :param max_requests: 单次批量请求的子请求数上限
+        :return: (规范化后的子请求列表, 是否并发执行)
+        """
+        if not isinstance(payload, dict) or not isinstance(payload.get('requests'), list):
+            raise ValueError('requests必须为子请求列表')
+        requests = payload['requests']
+        if not requests:
+            raise ValueError('requests不能为空')
+        if max_requests is None:
+            max_requests = current_app.config.get('BATCH_MAX_REQUESTS', BatchService.DEFAULT_MAX_REQUESTS)
+        if len(requests) > max_requests:
+            raise ValueError(f'单次批量请求最多包含{max_requests}个子请求')
+
+        specs = []
+        for index, item in enumerate(requests):
+            if not isinstance(item, dict):
+                raise ValueError(f'第{index + 1}个子请求格式错误')
+            method = str(item.get('method') or 'GET').upper()
+            if method not in BatchService.ALLOWED_METHODS:
+                raise ValueError(f"第{index + 1}个子请求的method必须为: {', '.join(BatchService.ALLOWED_METHODS)}")
+            path = item.get('path')
+            if not isinstance(path, str) or not path.startswith('/api/'):
+                raise ValueError(f'第{index + 1}个子请求的path必须以/api/开头')
+            path, _, query_string = path.partition('?')
+            if path.rstrip('/') == '/api/batch':
+                raise ValueError('子请求不能嵌套批量请求')
+            query = item.get('query')
+            if query is not None and not isinstance(query, dict):
+                raise ValueError(f'第{index + 1}个子请求的query必须为对象')
+            headers = item.get('headers') or {}
+            if not isinstance(headers, dict):
+                raise ValueError(f'第{index + 1}个子请求的headers必须为对象')
+            specs.append({
+                'id': item.get('id', index),
+                'method': method,
+                'path': path,
+                'query_string': query_string,
+                'query': query,
+                'headers': headers,
+                'body': item.get('body')
+            })
+        return specs, bool(payload.get('concurrent'))
+
+    @staticmethod
+    def execute(specs, concurrent=False, outer_headers=None, base_url=None):
+        """
+        执行子请求
+        :param specs: parse 返回的子请求列表
+        :param concurrent: 是否并发执行（仅当全部子请求为只读请求时生效）
+        :param outer_headers: 外层请求的请求头
+        :param base_url: 外层请求的根URL，子请求中生成的链接与外层请求一致
+        :return: 与子请求顺序一致的子响应列表
+        """
+        app = current_app._get_current_object()
+        inherited = {}
+        if outer_headers is not None:
+            for name in BatchService.INHERITED_HEADERS:
+                if name in outer_headers:
+                    inherited[name] = outer_headers[name]
+
+        environs = [BatchService._build_environ(spec, inherited, base_url) for spec in specs]
+
+        if concurrent and len(specs) > 1 and all(spec['method'] in BatchService.READ_METHODS for spec in specs):
+            def run(environ):
+                with app.app_context():
+                    return BatchService._dispatch(app, environ)
+            responses = list(BatchService._get_executor(app).map(run, environs))
+        else:
+            responses = [BatchService._dispatch(app, environ) for environ in environs]
+
+        return [
+            dict(id=spec['id'], **response)
+            for spec, response in zip(specs, responses)
+        ]
+
+    @staticmethod
+    def _build_environ(spec, inherited_headers, base_url):
+        headers = dict(inherited_headers)
+        headers.update(spec['headers'])
+        builder = EnvironBuilder(
+            path=spec['path'],
+            base_url=base_url,
+            method=spec['method'],
+            query_string=spec['query'] if spec['query'] is not None else spec['query_string'],
+            headers=headers,
+            json=spec['body'] if spec['body'] is not None else None
+        )
+        try:
+            return builder.get_environ()
+        finally:
+            builder.close()
+
+    @staticmethod
+    def _dispatch(app, environ):
+        """
+        在当前应用上下文内分发一个子请求
+        :return: {"status", "headers", "body"}
+        """
+        with app.request_context(environ):
+            try:
+                response = app.full_dispatch_request()
+            except Exception as e:
+                app.logger.exception('批量请求的子请求执行失败: %s', environ.get('PATH_INFO'))
+                response = app.make_response(({'error': f'子请求执行失败: {str(e)}'}, 500))
+
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name not in BatchService.EXCLUDED_RESPONSE_HEADERS
+        }
+        if response.is_json:
+            body = response.get_json(silent=True)
+        elif not response.direct_passthrough and (response.mimetype or '').startswith('text/'):
+            body = response.get_data(as_text=True)
+        else:
+            # 文件下载等二进制响应不适合放入JSON，调用方应单独请求
+            response.close()
+            body = {'error': '批量请求不支持文件下载等二进制响应，请单独请求该接口'}
+
+        # 子请求共用同一个会话：各接口自行提交成功的修改，返回4xx/5xx的子请求未提交的修改
+        # 或出错的事务在此回滚，不会被后续子请求的 commit() 一并提交
+        db.session.rollback()
+        return {'status': response.status_code, 'headers': headers, 'body': body}
+
+    @staticmethod
+    def _get_executor(app):
+        if BatchService._executor is None:
+            with BatchService._lock:
+                # 并发的首次请求只创建一个线程池
+                if BatchService._executor is None:
+                    BatchService._executor = ThreadPoolExecutor(
+                        max_workers=app.config.get('BATCH_WORKERS', BatchService.DEFAULT_WORKERS),
+                        thread_name_prefix='batch-request'
+                    )
+        return BatchService._executor
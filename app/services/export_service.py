@@ -0,0 +1,150 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select
+from app import db
+from app.models.project import Project, ProjectApplication
+from app.models.user import User
+from app.services.list_reader import ListReader, ProjectListItem, UserListItem, ApplicationListItem
+
+
+class ExportService:
+    """
+    项目/用户/项目申请全量导出
+
+    按主键顺序用服务端游标（stream_results + yield_per）逐批读取，每批构造为只读数据对象并
+    批量加载关联数据后立即序列化输出，内存占用只与批大小有关，与表的行数无关。
+    基础行使用独立的数据库连接读取：MySQL 的服务端游标未读完前同一连接不能执行其他查询，
+    关联数据的批量查询仍在当前会话中执行。
+    """
+
+    FORMAT_NDJSON = 'ndjson'
+    FORMAT_CSV = 'csv'
+    FORMATS = (FORMAT_NDJSON, FORMAT_CSV)
+    MIMETYPES = {
+        FORMAT_NDJSON: 'application/x-ndjson',
+        FORMAT_CSV: 'text/csv'
+    }
+
+    DEFAULT_BATCH_SIZE = 1000
+
+    # 可导出的资源：模型、只读数据对象
+    RESOURCES = {
+        'projects': (Project, ProjectListItem),
+        'users': (User, UserListItem),
+        'applications': (ProjectApplication, ApplicationListItem)
+    }
+
+    @staticmethod
+    def parse_since(value):
+        """
+        解析 updated_since 参数
+        :param value: 'YYYY-MM-DD'、'YYYY-MM-DD HH:MM:SS' 或 ISO 8601 时间
+        :return: datetime 或 None
+        """
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.strip().replace('Z', '+00:00')).replace(tzinfo=None)
+        except ValueError:
+            raise ValueError('updated_since格式错误，应为 YYYY-MM-DD 或 YYYY-MM-DD HH:MM:SS')
+
+    @staticmethod
+    def iter_rows(resource, updated_since=None, fields=None, batch_size=None):
+        """
+        逐批读取导出数据
+        :param resource: 'projects'、'users' 或 'applications'
+        :param updated_since: 只导出该时间之后（含）更新过的数据
+        :param fields: 只导出的字段，为None时导出全部字段（与列表接口相同，项目不含最近参与者）
+        :param batch_size: 每批读取的行数
+        :return: 生成每批的字典列表
+        """
+        if resource not in ExportService.RESOURCES:
+            raise ValueError(f"不支持的导出数据: {resource}，可选值: {', '.join(ExportService.RESOURCES)}")
+        model, item_class = ExportService.RESOURCES[resource]
+        batch_size = batch_size or current_app.config.get('EXPORT_BATCH_SIZE', ExportService.DEFAULT_BATCH_SIZE)
+        if fields is not None and model is Project:
+            fields = tuple(field for field in fields if field != 'recent_participants')
+
+        names = ListReader.column_names(item_class, model, fields)
+        statement = select(*[getattr(model, name) for name in names]).order_by(model.id)
+        if updated_since is not None:
+            statement = statement.where(model.updated_at >= updated_since)
+
+        with db.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(statement)
+            for partition in result.partitions():
+                items = [item_class(names, row) for row in partition]
+                if model is Project:
+                    if fields is None or 'creator_info' in fields:
+                        ListReader.load_creators(items)
+                    if fields is None or 'skill_requirements' in fields:
+                        ListReader.load_skill_requirements(items)
+                elif model is ProjectApplication:
+                    if fields is None or 'skill_type_name' in fields:
+                        ListReader.load_skill_type_names(items)
+                yield [item.to_dict(fields) for item in items]
+
+    @staticmethod
+    def serialize(batches, fmt):
+        """
+        把逐批的字典列表序列化为 NDJSON 或 CSV 文本块（每批一块）
+        :return: 生成UTF-8字节块
+        """
+        if fmt == ExportService.FORMAT_NDJSON:
+            dumps = current_app.json.dumps
+            for rows in batches:
+                if rows:
+                    yield ''.join(dumps(row) + '\n' for row in rows).encode('utf-8')
+        elif fmt == ExportService.FORMAT_CSV:
+            header = None
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for rows in batches:
+                if not rows:
+                    continue
+                if header is None:
+                    header = list(rows[0])
+                    writer.writerow(header)
+                for row in rows:
+                    # 嵌套的对象和列表（创建者、技能需求、关键因素等）以JSON字符串写入单元格
+                    writer.writerow([
+                        json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+                        for value in (row.get(column) for column in header)
+                    ])
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        else:
+            raise ValueError(f"不支持的导出格式，可选值: {', '.join(ExportService.FORMATS)}")
+
+    @staticmethod
+    def gzip_chunks(chunks, level=6):
+        """
+        把字节块流压缩为gzip流，每个输入块压缩后立即输出
+        """
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    @staticmethod
+    def export(resource, fmt=FORMAT_NDJSON, updated_since=None, fields=None, batch_size=None, gzip=False):
+        """
+        导出数据
+        :param resource: 'projects'、'users' 或 'applications'
+        :param fmt: 'ndjson' 或 'csv'
+        :param gzip: 是否压缩为gzip流
+        :return: 生成字节块（其余参数见 iter_rows）
+        """
+        if fmt not in ExportService.FORMATS:
+            raise ValueError(f"不支持的导出格式，可选值: {', '.join(ExportService.FORMATS)}")
+        if resource not in ExportService.RESOURCES:
+            raise ValueError(f"不支持的导出数据: {resource}，可选值: {', '.join(ExportService.RESOURCES)}")
+        chunks = ExportService.serialize(ExportService.iter_rows(resource, updated_since, fields, batch_size), fmt)
+        return ExportService.gzip_chunks(chunks) if gzip else chunks
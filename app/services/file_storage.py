@@ -0,0 +1,180 @@
+import hashlib
+import os
+import tempfile
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import secure_filename
+from app import db
+from app.models.project import StoredFile
+from app.services.job_queue import JobQueue
+
+class FileStorageService:
+    """
+    按内容寻址的文件存储
+
+    上传内容分块写入临时文件并同时计算SHA-256，超过大小限制立即中止；
+    文件按哈希存放在 static/deliverables/objects/<ab>/<cd>/<sha256><扩展名>，
+    相同内容只保存一份，stored_files.ref_count 记录引用数，引用归零时删除文件。
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    DEFAULT_MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+    # 图片交付物的派生文件：缩略图、预览图
+    VARIANTS = ('thumb', 'preview')
+
+    @staticmethod
+    def storage_root():
+        """文件存储根目录"""
+        return os.path.join(current_app.root_path, 'static', 'deliverables')
+
+    @staticmethod
+    def max_upload_size():
+        """单个文件的大小上限（字节）"""
+        return current_app.config.get('DELIVERABLE_MAX_UPLOAD_SIZE', FileStorageService.DEFAULT_MAX_UPLOAD_SIZE)
+
+    @staticmethod
+    def absolute_path(stored_file):
+        """存储文件的绝对路径"""
+        return os.path.join(FileStorageService.storage_root(), stored_file.storage_path)
+
+    @staticmethod
+    def _object_path(sha256, extension):
+        return os.path.join('objects', sha256[:2], sha256[2:4], sha256 + extension)
+
+    @staticmethod
+    def variant_path(sha256, variant):
+        """按内容寻址文件的派生文件（缩略图、预览图）路径，与原文件存放在同一目录"""
+        return os.path.join('objects', sha256[:2], sha256[2:4], f'{sha256}.{variant}.webp')
+
+    @staticmethod
+    def _extension(filename):
+        extension = os.path.splitext(secure_filename(filename or ''))[1].lower()
+        # 仅保留常规扩展名，用于下载时推断文件类型
+        return extension if 1 < len(extension) <= 10 else ''
+
+    @staticmethod
+    def _stream_to_temp(file):
+        """
+        分块读取上传流写入临时文件，同时计算SHA-256
+        :return: (临时文件路径, sha256, 文件大小)
+        """
+        max_size = FileStorageService.max_upload_size()
+        tmp_dir = os.path.join(FileStorageService.storage_root(), 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                while True:
+                    chunk = file.stream.read(FileStorageService.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_size:
+                        raise ValueError(f'文件大小超过限制（最大 {max_size} 字节）')
+                    digest.update(chunk)
+                    tmp.write(chunk)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path, digest.hexdigest(), size
+
+    @staticmethod
+    def store(file):
+        """
+        保存上传文件（不提交事务）
+        :param file: werkzeug FileStorage 对象
+        :return: StoredFile 对象，内容已存在时引用计数加一
+        """
+        tmp_path, sha256, size = FileStorageService._stream_to_temp(file)
+        try:
+            stored_file = StoredFile.query.filter_by(sha256=sha256).with_for_update().first()
+            if stored_file:
+                stored_file.ref_count = StoredFile.ref_count + 1
+                db.session.flush()
+                return stored_file
+
+            # 先插入记录再写入文件：未提交的新记录会阻塞删除任务对同一内容的加锁读取，
+            # 删除任务持有锁期间插入也会等待，避免删除任务删掉刚写入的文件
+            storage_path = FileStorageService._object_path(sha256, FileStorageService._extension(file.filename))
+            stored_file = StoredFile(sha256=sha256, size=size, storage_path=storage_path, ref_count=1)
+            try:
+                with db.session.begin_nested():
+                    db.session.add(stored_file)
+            except IntegrityError:
+                # 并发上传了相同内容，改为增加引用计数
+                stored_file = StoredFile.query.filter_by(sha256=sha256).with_for_update().first()
+                stored_file.ref_count = StoredFile.ref_count + 1
+                db.session.flush()
+                return stored_file
+
+            target = os.path.join(FileStorageService.storage_root(), storage_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(tmp_path, target)
+            tmp_path = None
+            # 事务回滚时记录随之撤销，由 _remove_after_rollback 清理已写入的文件
+            db.session.info.setdefault('stored_files_written', []).append((sha256, storage_path))
+            return stored_file
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def release(sha256):
+        """
+        释放一次文件引用（不提交事务）
+        引用归零时删除记录，并在当前事务中加入删除文件的后台任务，事务提交后执行
+        :return: 引用是否已归零
+        """
+        if not sha256:
+            return False
+        stored_file = StoredFile.query.filter_by(sha256=sha256).with_for_update().first()
+        if not stored_file:
+            return False
+        if stored_file.ref_count > 1:
+            stored_file.ref_count = StoredFile.ref_count - 1
+            db.session.flush()
+            return False
+        JobQueue.enqueue('file.remove', {'sha256': sha256, 'storage_path': stored_file.storage_path})
+        db.session.delete(stored_file)
+        db.session.flush()
+        return True
+
+    @staticmethod
+    def remove_file(sha256, storage_path):
+        """
+        删除已无引用的文件及其缩略图（后台任务，可重复执行）
+        删除前对 stored_files 记录加锁再次确认没有上传重新引用了相同内容，锁持有到任务提交，
+        期间相同内容的上传会等待，之后重新写入文件
+        """
+        if StoredFile.query.filter_by(sha256=sha256).with_for_update().first() is not None:
+            return
+        root = FileStorageService.storage_root()
+        paths = [storage_path] + [FileStorageService.variant_path(sha256, variant) for variant in FileStorageService.VARIANTS]
+        for path in paths:
+            path = os.path.join(root, path)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+JobQueue.register('file.remove', FileStorageService.remove_file)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _forget_after_commit(session):
+    session.info.pop('stored_files_written', None)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _remove_after_rollback(session):
+    """
+    事务回滚后，本事务新写入的文件已没有 stored_files 记录，加入删除文件的后台任务
+    （删除前会再次确认没有并发上传重新引用了相同内容）；保存点回滚不影响外层事务，忽略
+    """
+    if session.in_nested_transaction():
+        return
+    for sha256, storage_path in session.info.pop('stored_files_written', []):
+        JobQueue.enqueue_detached('file.remove', {'sha256': sha256, 'storage_path': storage_path})
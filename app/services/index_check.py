@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app import db
+from app.models.project import Project, ProjectApplication, ProjectDeliverable, SkillType
+from app.models.user import User
+from app.services.project_service import ProjectService, ProjectApplicationService, ProjectDeliverableService
+from app.utils.query_plan import capture_statements, explain
+
+class IndexCheckService:
+    """
+    检查热点查询是否使用索引
+
+    实际调用服务层的查询方法，记录其执行的 SELECT 语句，对每条语句执行 EXPLAIN，
+    热点表（projects、project_applications、project_deliverables）出现全表扫描时视为未命中索引。
+    可先在当前事务中生成测试数据，检查结束后回滚。
+    """
+
+    CHECKED_TABLES = ('projects', 'project_applications', 'project_deliverables')
+    SEED_USER_PREFIX = 'index-check|'
+
+    @staticmethod
+    def seed(rows, batch_size=5000):
+        """
+        在当前事务中生成测试数据（不提交）
+        :param rows: 项目数量，申请数为其3倍，交付物数为其2倍
+        """
+        prefix = IndexCheckService.SEED_USER_PREFIX
+        user_count = max(rows // 10, 3)
+        db.session.execute(insert(User), [
+            {'email': f'{prefix}{i}@thehive.com', 'user_id': f'{prefix}{i}', 'full_name': f'Index Check {i}'}
+            for i in range(user_count)
+        ])
+        skill_type = SkillType.query.first()
+        if not skill_type:
+            skill_type = SkillType(name=f'{prefix}skill')
+            db.session.add(skill_type)
+            db.session.flush()
+
+        base = datetime(2024, 1, 1)
+        types = ['Startup', 'Research', 'Competition']
+        for start in range(0, rows, batch_size):
+            db.session.execute(insert(Project), [{
+                'name': f'Index check project {i}',
+                'project_type': types[i % len(types)],
+                'end_time': base + timedelta(days=365),
+                'status': Project.STATUS_IN_PROGRESS if i % 4 else Project.STATUS_COMPLETED,
+                'recruitment_status': Project.RECRUITMENT_OPEN if i % 3 else Project.RECRUITMENT_CLOSED,
+                'user_id': f'{prefix}{i % user_count}',
+                'created_at': base + timedelta(minutes=i),
+                'updated_at': base + timedelta(minutes=i)
+            } for i in range(start, min(start + batch_size, rows))])
+
+        project_ids = [project_id for (project_id,) in db.session.query(Project.id).filter(
+            Project.user_id.like(f'{prefix}%')
+        ).order_by(Project.id)]
+        statuses = [ProjectApplication.STATUS_PENDING, ProjectApplication.STATUS_APPROVED, ProjectApplication.STATUS_REJECTED]
+        applications, deliverables = [], []
+        for n, project_id in enumerate(project_ids):
+            for k in range(3):
+                applications.append({
+                    'project_id': project_id,
+                    'user_id': f'{prefix}{(n + k + 1) % user_count}',
+                    'skill_type_id': skill_type.id,
+                    'status': statuses[(n + k) % len(statuses)],
+                    'created_at': base + timedelta(minutes=n + k),
+                    'updated_at': base + timedelta(minutes=n + k)
+                })
+            for k in range(2):
+                deliverables.append({
+                    'project_id': project_id,
+                    'uploader_id': f'{prefix}{n % user_count}',
+                    'file_name': f'deliverable-{n}-{k}.pdf',
+                    'status': ProjectDeliverable.STATUS_SUBMITTED,
+                    'created_at': base + timedelta(minutes=n + k),
+                    'updated_at': base + timedelta(minutes=n + k)
+                })
+        for start in range(0, len(applications), batch_size):
+            db.session.execute(insert(ProjectApplication), applications[start:start + batch_size])
+        for start in range(0, len(deliverables), batch_size):
+            db.session.execute(insert(ProjectDeliverable), deliverables[start:start + batch_size])
+        db.session.flush()
+
+    @staticmethod
+    def hot_paths(user_id, project_id):
+        """
+        需要检查的热点查询
+        :return: [(名称, 调用服务方法的函数)]
+        """
+        pagination = {'limit': 20, 'sort': 'created_at', 'order': 'desc', 'cursor': None, 'with_total': False}
+        filters = {'status': '1', 'recruitment_status': '1', 'project_types': ['Startup', 'Research']}
+        deliverable_pagination = {'limit': 20, 'sort': 'created_at', 'order': 'asc', 'cursor': None, 'with_total': False}
+        return [
+            ('项目列表（状态/招募状态/类型筛选）', lambda: ProjectService.get_project_list(dict(filters), pagination)),
+            ('我创建的项目', lambda: ProjectService.get_founder_project_list({'user_id': user_id}, pagination)),
+            ('我参与的项目', lambda: ProjectService.get_participant_project_list({'user_id': user_id}, pagination)),
+            ('我的申请', lambda: ProjectApplicationService.get_my_applications(user_id)),
+            ('项目收到的申请', lambda: ProjectApplicationService.get_project_applications(project_id)),
+            ('项目交付物列表', lambda: ProjectDeliverableService.get_deliverables_by_project(project_id, pagination=deliverable_pagination)),
+        ]
+
+    @staticmethod
+    def run(user_id=None, project_id=None):
+        """
+        执行热点查询并检查执行计划
+        :param user_id: 查询使用的用户ID，默认取生成的测试用户或任一项目创建者
+        :param project_id: 查询使用的项目ID，默认取该用户创建的任一项目
+        :return: 检查结果列表 [{'name', 'statement', 'plan', 'count', 'ok'}]
+        """
+        if user_id is None:
+            seeded = f'{IndexCheckService.SEED_USER_PREFIX}0'
+            if User.query.filter_by(user_id=seeded).first():
+                user_id = seeded
+            else:
+                row = db.session.query(Project.user_id).first()
+                if not row:
+                    raise ValueError('数据库中没有项目，请使用 --seed 生成测试数据')
+                user_id = row[0]
+        if project_id is None:
+            project_id = db.session.query(Project.id).filter(Project.user_id == user_id).order_by(Project.id).first()[0]
+
+        report = []
+        for name, call in IndexCheckService.hot_paths(user_id, project_id):
+            with capture_statements() as statements:
+                call()
+            # 相同语句（如逐行懒加载）只检查一次
+            seen = {}
+            for statement, parameters in statements:
+                if statement in seen:
+                    seen[statement]['count'] += 1
+                    continue
+                plan = [row for row in explain(statement, parameters) if row['table'] in IndexCheckService.CHECKED_TABLES]
+                item = {
+                    'name': name,
+                    'statement': ' '.join(statement.split()),
+                    'plan': plan,
+                    'count': 1,
+                    'ok': not any(row['full_scan'] for row in plan)
+                }
+                seen[statement] = item
+                if plan:
+                    report.append(item)
+        return report
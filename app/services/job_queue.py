@@ -0,0 +1,324 @@
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app import db
+from app.models.background_job import BackgroundJob
+from app.utils.database import supports_skip_locked
+
+class JobQueue:
+    """
+    基于 background_jobs 表的持久化后台任务队列
+
+    任务在业务事务内写入队列表，随业务数据一起提交（不会出现业务已提交但任务丢失的情况）。
+    执行方式由 JOB_EXECUTION_MODE 配置：
+    - thread（默认）: 事务提交后由进程内线程池立即执行，另有轮询线程处理延迟重试的任务
+    - worker: 请求进程只入队，由独立的 `flask worker` 进程执行
+
+    任务至少执行一次，失败后按指数退避重试，超过 max_attempts 次标记为失败；
+    处理函数必须是幂等的。指定 dedupe_key 时同一键只保留一个待执行任务。
+    """
+
+    MODE_THREAD = 'thread'
+    MODE_WORKER = 'worker'
+
+    DEFAULT_WORKERS = 2
+    DEFAULT_POLL_INTERVAL = 5
+    DEFAULT_MAX_ATTEMPTS = 5
+    DEFAULT_RETRY_DELAY = 10
+    MAX_RETRY_DELAY = 3600
+    # 执行中的任务超过该时间未结束视为执行者已退出，重新放回队列
+    DEFAULT_LOCK_TIMEOUT = 300
+    # 已完成的任务保留时间（秒），之后由 prune 删除
+    DEFAULT_RETENTION = 7 * 24 * 3600
+    DEFAULT_PRUNE_INTERVAL = 3600
+    PRUNE_BATCH_SIZE = 1000
+
+    _handlers = {}
+    _executor = None
+    _poller = None
+    _lock = threading.Lock()
+    _draining = 0
+    _last_prune = 0
+
+    @staticmethod
+    def register(job_type, handler):
+        """
+        注册任务处理函数，任务参数作为关键字参数传入
+        :param job_type: 任务类型
+        :param handler: 处理函数
+        """
+        JobQueue._handlers[job_type] = handler
+
+    @staticmethod
+    def enqueue(job_type, payload=None, dedupe_key=None, delay=0, max_attempts=None):
+        """
+        在当前事务中加入后台任务（不提交事务）
+        :param job_type: 任务类型
+        :param payload: 任务参数字典
+        :param dedupe_key: 去重键，已存在相同键的待执行任务时不重复加入
+        :param delay: 延迟执行的秒数
+        :param max_attempts: 最大执行次数
+        :return: BackgroundJob 对象
+        """
+        if dedupe_key:
+            existing = BackgroundJob.query.filter_by(dedupe_key=dedupe_key).first()
+            if existing:
+                return existing
+
+        job = BackgroundJob(
+            job_type=job_type,
+            dedupe_key=dedupe_key,
+            run_at=datetime.now() + timedelta(seconds=delay),
+            max_attempts=max_attempts or JobQueue.DEFAULT_MAX_ATTEMPTS
+        )
+        job.set_payload(payload)
+        try:
+            with db.session.begin_nested():
+                db.session.add(job)
+        except IntegrityError:
+            # 并发加入了相同去重键的任务
+            return BackgroundJob.query.filter_by(dedupe_key=dedupe_key).first()
+        db.session.info['background_jobs_enqueued'] = True
+        return job
+
+    @staticmethod
+    def enqueue_detached(job_type, payload=None):
+        """
+        在独立的事务中加入后台任务并立即提交，不受当前会话事务的影响
+        用于当前事务回滚后仍需执行的清理（如删除回滚前已写入磁盘的文件）
+        :param job_type: 任务类型
+        :param payload: 任务参数字典
+        """
+        job = BackgroundJob(
+            job_type=job_type,
+            run_at=datetime.now(),
+            max_attempts=JobQueue.DEFAULT_MAX_ATTEMPTS
+        )
+        job.set_payload(payload)
+        with Session(db.engine) as session, session.begin():
+            session.add(job)
+        if current_app.config.get('JOB_EXECUTION_MODE', JobQueue.MODE_THREAD) == JobQueue.MODE_THREAD:
+            JobQueue.kick()
+
+    @staticmethod
+    def worker_id():
+        """执行者标识：主机名:进程号:线程名"""
+        return f'{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}'
+
+    @staticmethod
+    def claim(batch_size=10):
+        """
+        领取到期的待执行任务并标记为执行中
+        领取时清除去重键，任务执行期间产生的新触发会重新入队，不会被正在执行的任务吞掉
+        :return: 任务ID列表
+        """
+        now = datetime.now()
+        lock_timeout = current_app.config.get('JOB_LOCK_TIMEOUT', JobQueue.DEFAULT_LOCK_TIMEOUT)
+        BackgroundJob.query.filter(
+            BackgroundJob.status == BackgroundJob.STATUS_RUNNING,
+            BackgroundJob.locked_at < now - timedelta(seconds=lock_timeout)
+        ).update({BackgroundJob.status: BackgroundJob.STATUS_PENDING}, synchronize_session=False)
+
+        query = BackgroundJob.query.filter(
+            BackgroundJob.status == BackgroundJob.STATUS_PENDING,
+            BackgroundJob.run_at <= now
+        ).order_by(BackgroundJob.run_at, BackgroundJob.id).limit(batch_size)
+        # 多个执行者并发领取时跳过其他执行者已锁定的任务
+        query = query.with_for_update(skip_locked=supports_skip_locked())
+
+        worker_id = JobQueue.worker_id()
+        jobs = query.all()
+        for job in jobs:
+            job.status = BackgroundJob.STATUS_RUNNING
+            job.attempts = job.attempts + 1
+            job.locked_at = now
+            job.locked_by = worker_id
+            job.dedupe_key = None
+        db.session.commit()
+        return [job.id for job in jobs]
+
+    @staticmethod
+    def _retry_delay(attempts):
+        base = current_app.config.get('JOB_RETRY_DELAY', JobQueue.DEFAULT_RETRY_DELAY)
+        return min(base * 2 ** (attempts - 1), JobQueue.MAX_RETRY_DELAY)
+
+    @staticmethod
+    def run(job_id):
+        """
+        执行一个已领取的任务，失败时安排重试
+        :return: 是否执行成功
+        """
+        job = db.session.get(BackgroundJob, job_id)
+        if not job or job.status != BackgroundJob.STATUS_RUNNING:
+            return False
+        handler = JobQueue._handlers.get(job.job_type)
+        payload = job.get_payload()
+        try:
+            if handler is None:
+                raise LookupError(f'未注册的任务类型: {job.job_type}')
+            handler(**payload)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            job = db.session.get(BackgroundJob, job_id)
+            job.last_error = traceback.format_exc()[-4000:]
+            job.locked_at = None
+            job.locked_by = None
+            if job.attempts >= job.max_attempts:
+                job.status = BackgroundJob.STATUS_FAILED
+                current_app.logger.error('后台任务 %s(%s) 执行失败，已放弃重试', job.job_type, job_id)
+            else:
+                job.status = BackgroundJob.STATUS_PENDING
+                job.run_at = datetime.now() + timedelta(seconds=JobQueue._retry_delay(job.attempts))
+            db.session.commit()
+            return False
+
+        job = db.session.get(BackgroundJob, job_id)
+        job.status = BackgroundJob.STATUS_DONE
+        job.locked_at = None
+        job.last_error = None
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def run_pending(batch_size=10):
+        """
+        执行所有到期的任务，直到队列中没有到期任务
+        :return: 执行的任务数
+        """
+        count = 0
+        while True:
+            job_ids = JobQueue.claim(batch_size)
+            if not job_ids:
+                return count
+            for job_id in job_ids:
+                JobQueue.run(job_id)
+                count += 1
+
+    @staticmethod
+    def prune(retention=None):
+        """
+        删除超过保留时间的已完成任务（失败的任务保留，便于排查）
+
+        按 (status, run_at) 索引分批删除，每批单独提交，避免长时间锁表
+        :param retention: 保留时间（秒），默认为 JOB_RETENTION 配置
+        :return: 删除的任务数
+        """
+        if retention is None:
+            retention = current_app.config.get('JOB_RETENTION', JobQueue.DEFAULT_RETENTION)
+        cutoff = datetime.now() - timedelta(seconds=retention)
+        deleted = 0
+        while True:
+            job_ids = [row.id for row in db.session.query(BackgroundJob.id).filter(
+                BackgroundJob.status == BackgroundJob.STATUS_DONE,
+                BackgroundJob.run_at < cutoff
+            ).limit(JobQueue.PRUNE_BATCH_SIZE).all()]
+            if not job_ids:
+                return deleted
+            BackgroundJob.query.filter(
+                BackgroundJob.id.in_(job_ids),
+                BackgroundJob.status == BackgroundJob.STATUS_DONE
+            ).delete(synchronize_session=False)
+            db.session.commit()
+            deleted += len(job_ids)
+
+    @classmethod
+    def prune_if_due(cls):
+        """
+        距上次清理超过 JOB_PRUNE_INTERVAL 秒时清理已完成的任务（由执行者循环和轮询线程调用）
+        :return: 删除的任务数
+        """
+        interval = current_app.config.get('JOB_PRUNE_INTERVAL', cls.DEFAULT_PRUNE_INTERVAL)
+        now = time.monotonic()
+        with cls._lock:
+            if cls._last_prune and now - cls._last_prune < interval:
+                return 0
+            cls._last_prune = now
+        try:
+            return cls.prune()
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception('清理已完成的后台任务失败')
+            return 0
+
+    @staticmethod
+    def work(batch_size=10, poll_interval=None, once=False):
+        """
+        独立执行者进程的主循环（flask worker）
+        :param once: 为True时执行完当前到期任务后退出
+        """
+        poll_interval = poll_interval or current_app.config.get('JOB_POLL_INTERVAL', JobQueue.DEFAULT_POLL_INTERVAL)
+        while True:
+            try:
+                count = JobQueue.run_pending(batch_size)
+            except Exception:
+                db.session.rollback()
+                current_app.logger.exception('领取后台任务失败')
+                count = 0
+            JobQueue.prune_if_due()
+            if once:
+                return count
+            if not count:
+                time.sleep(poll_interval)
+
+    @classmethod
+    def _drain(cls, app):
+        with app.app_context():
+            try:
+                cls.run_pending()
+            except Exception:
+                db.session.rollback()
+                app.logger.exception('执行后台任务失败')
+            finally:
+                with cls._lock:
+                    cls._draining -= 1
+
+    @classmethod
+    def _poll(cls, app, interval):
+        while True:
+            time.sleep(interval)
+            cls.kick(app)
+            with app.app_context():
+                cls.prune_if_due()
+
+    @classmethod
+    def kick(cls, app=None):
+        """
+        通知进程内线程池执行到期任务（thread 模式）
+        已有足够的线程在执行时不再重复提交
+        """
+        app = app or current_app._get_current_object()
+        workers = app.config.get('JOB_WORKERS', cls.DEFAULT_WORKERS)
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+            if cls._poller is None:
+                interval = app.config.get('JOB_POLL_INTERVAL', cls.DEFAULT_POLL_INTERVAL)
+                cls._poller = threading.Thread(target=cls._poll, args=(app, interval), name='job-poller', daemon=True)
+                cls._poller.start()
+            if cls._draining >= workers:
+                return
+            cls._draining += 1
+        cls._executor.submit(cls._drain, app)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _dispatch_after_commit(session):
+    """事务提交后，thread 模式下立即通知线程池执行新加入的任务"""
+    if not session.info.pop('background_jobs_enqueued', False):
+        return
+    if current_app.config.get('JOB_EXECUTION_MODE', JobQueue.MODE_THREAD) == JobQueue.MODE_THREAD:
+        JobQueue.kick()
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('background_jobs_enqueued', None)
@@ -0,0 +1,299 @@
+from sqlalchemy import Select
+from app import db
+from app.models.project import Project, SkillRequirement, SkillType, ProjectApplication
+from app.models.user import User
+from app.utils.serialization import format_datetime
+
+
+class ProjectListItem:
+    """
+    项目列表的只读数据对象
+
+    由列查询的结果行直接构造，不经过ORM实体的实例化、属性插桩和会话标识映射，
+    输出与 Project.to_dict 相同的字典。
+    """
+
+    # 可从 projects 表查询的列（按 Project 字段顺序）
+    COLUMNS = ('id', 'name', 'project_type', 'end_time', 'description', 'goal', 'status',
+               'recruitment_status', 'user_id', 'created_at', 'updated_at')
+
+    __slots__ = COLUMNS + ('creator_info', 'skill_requirements', 'recent_participants')
+
+    def __init__(self, names, row):
+        """
+        :param names: 查询的列名，与 row 中的值一一对应（row 末尾多出的值会被忽略，如相关度）
+        :param row: 结果行
+        """
+        for name, value in zip(names, row):
+            setattr(self, name, value)
+        self.creator_info = None
+        self.skill_requirements = []
+        self.recent_participants = None
+
+    def to_dict(self, fields=None):
+        """
+        转换为字典
+        :param fields: 只输出的字段（见 Project.FIELD_COLUMNS），为None时输出全部字段
+        """
+        if fields is None:
+            data = {
+                'id': self.id,
+                'name': self.name,
+                'project_type': self.project_type,
+                'end_time': format_datetime(self.end_time),
+                'description': self.description,
+                'goal': self.goal,
+                'status': self.status,
+                'status_text': 'In progress' if self.status == Project.STATUS_IN_PROGRESS else 'Completed',
+                'recruitment_status': self.recruitment_status,
+                'recruitment_status_text': 'Open for application' if self.recruitment_status == Project.RECRUITMENT_OPEN else 'Application closed',
+                'user_id': self.user_id,
+                'creator_info': self.creator_info,
+                'recent_participants': self.recent_participants,
+                'skill_requirements': self.skill_requirements,
+                'created_at': format_datetime(self.created_at),
+                'updated_at': format_datetime(self.updated_at)
+            }
+            if self.recent_participants is None:
+                del data['recent_participants']
+            return data
+
+        data = {}
+        for field in fields:
+            if field in ('end_time', 'created_at', 'updated_at'):
+                data[field] = format_datetime(getattr(self, field))
+            elif field == 'status_text':
+                data[field] = 'In progress' if self.status == Project.STATUS_IN_PROGRESS else 'Completed'
+            elif field == 'recruitment_status_text':
+                data[field] = 'Open for application' if self.recruitment_status == Project.RECRUITMENT_OPEN else 'Application closed'
+            elif field == 'recent_participants':
+                if self.recent_participants is not None:
+                    data[field] = self.recent_participants
+            else:
+                data[field] = getattr(self, field)
+        return data
+
+
+class UserListItem:
+    """
+    用户列表的只读数据对象，输出与 User.to_dict 相同的字典
+    """
+
+    COLUMNS = ('id', 'email', 'full_name', 'gender', 'mbti', 'star_sign', 'skills', 'interests',
+               'year_of_study', 'major', 'key_factors', 'lightning_answers', 'picture', 'user_id',
+               'created_at', 'updated_at')
+
+    __slots__ = COLUMNS
+
+    def __init__(self, names, row):
+        for name, value in zip(names, row):
+            setattr(self, name, value)
+
+    # 与 User 共用JSON字段的解析逻辑
+    get_key_factors = User.get_key_factors
+    get_lightning_answers = User.get_lightning_answers
+
+    def to_dict(self, fields=None):
+        """
+        转换为字典
+        :param fields: 只输出的字段（见 User.FIELD_COLUMNS），为None时输出全部字段
+        """
+        if fields is not None:
+            data = {}
+            for field in fields:
+                if field == 'key_factors':
+                    data[field] = self.get_key_factors()
+                elif field == 'lightning_answers':
+                    data[field] = self.get_lightning_answers()
+                elif field in ('created_at', 'updated_at'):
+                    data[field] = format_datetime(getattr(self, field))
+                else:
+                    data[field] = getattr(self, field)
+            return data
+        return {
+            'id': self.id,
+            'email': self.email,
+            'full_name': self.full_name,
+            'gender': self.gender,
+            'mbti': self.mbti,
+            'star_sign': self.star_sign,
+            'skills': self.skills,
+            'interests': self.interests,
+            'year_of_study': self.year_of_study,
+            'major': self.major,
+            'key_factors': self.get_key_factors(),
+            'lightning_answers': self.get_lightning_answers(),
+            'picture': self.picture,
+            'user_id': self.user_id,
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at)
+        }
+
+
+class ApplicationListItem:
+    """
+    项目申请的只读数据对象，输出 ProjectApplication.to_dict 中申请本身的字段（不含项目和创建者信息）
+    """
+
+    COLUMNS = ('id', 'project_id', 'user_id', 'skill_type_id', 'message', 'status', 'response_message',
+               'created_at', 'updated_at')
+
+    __slots__ = COLUMNS + ('skill_type_name',)
+
+    def __init__(self, names, row):
+        for name, value in zip(names, row):
+            setattr(self, name, value)
+        self.skill_type_name = None
+
+    def to_dict(self, fields=None):
+        """
+        转换为字典
+        :param fields: 只输出的字段（见 ProjectApplication.FIELD_COLUMNS），为None时输出全部字段
+        """
+        data = {}
+        for field in fields if fields is not None else ProjectApplication.FIELD_COLUMNS:
+            if field == 'status_text':
+                data[field] = ProjectApplication.STATUS_TEXT.get(self.status, 'Unknown status')
+            elif field in ('created_at', 'updated_at'):
+                data[field] = format_datetime(getattr(self, field))
+            else:
+                data[field] = getattr(self, field)
+        return data
+
+
+class ListReader:
+    """
+    列表接口的只读查询
+
+    把已应用过滤条件的查询改为只查询所需的列，结果行直接构造为 __slots__ 数据对象，
+    关联数据（创建者、技能需求、最近参与者）同样以列查询批量加载。
+    查询结果不进入会话，适用于只读的列表接口；需要修改对象时仍应使用ORM实体。
+    """
+
+    @staticmethod
+    def column_names(item_class, model, fields, *extra):
+        """
+        需要查询的列名
+        :param fields: 输出字段，为None时查询全部列
+        :param extra: 额外需要的列名，如排序键
+        """
+        if fields is None:
+            return item_class.COLUMNS
+        names = {'id', *extra}
+        for field in fields:
+            names.update(model.FIELD_COLUMNS.get(field, ()))
+        return tuple(name for name in item_class.COLUMNS if name in names)
+
+    @staticmethod
+    def _with_columns(query, columns):
+        """将查询改为只查询指定的列（ORM Query 或 select 语句）"""
+        if isinstance(query, Select):
+            return query.with_only_columns(*columns)
+        return query.with_entities(*columns)
+
+    @staticmethod
+    def projects(query, paginator=None, pagination=None, computed_keys=None, fields=None,
+                 include_recent_participants=False, params=None):
+        """
+        读取项目列表
+        :param query: 已应用过滤条件的项目查询（ORM Query 或 select 语句）
+        :param paginator: 游标分页器，为None时返回全部结果
+        :param pagination: 游标分页参数
+        :param computed_keys: 查询时计算的排序表达式，如全文检索的相关度
+        :param fields: 只返回的字段，为None时返回全部字段
+        :param include_recent_participants: 是否包含最近参与者信息
+        :param params: select 语句的绑定参数
+        :return: (字典列表, 下一页游标, 总数或None)
+        """
+        extra = ()
+        if paginator and pagination and paginator.sort_keys[pagination['sort']] is not None:
+            # 游标由最后一行的排序键生成
+            extra = (pagination['sort'],)
+        names = ListReader.column_names(ProjectListItem, Project, fields, *extra)
+        query = ListReader._with_columns(query, [getattr(Project, name) for name in names])
+
+        def build(row):
+            return ProjectListItem(names, row)
+
+        if paginator:
+            items, next_cursor, total = paginator.paginate(query, pagination, computed_keys, row_factory=build, params=params)
+        elif isinstance(query, Select):
+            items, next_cursor, total = [build(row) for row in db.session.execute(query, params or {})], None, None
+        else:
+            items, next_cursor, total = [build(row) for row in query], None, None
+
+        if items:
+            if fields is None or 'creator_info' in fields:
+                ListReader.load_creators(items)
+            if fields is None or 'skill_requirements' in fields:
+                ListReader.load_skill_requirements(items)
+            if include_recent_participants and (fields is None or 'recent_participants' in fields):
+                participants = ProjectApplication.get_recent_participants(
+                    [item.id for item in items], Project.RECENT_PARTICIPANT_LIMIT
+                )
+                for item in items:
+                    item.recent_participants = participants.get(item.id, [])
+        return [item.to_dict(fields) for item in items], next_cursor, total
+
+    @staticmethod
+    def load_creators(items):
+        """批量加载创建者简要信息"""
+        rows = db.session.query(
+            User.user_id, User.picture, User.full_name, User.major, User.year_of_study
+        ).filter(User.user_id.in_({item.user_id for item in items}))
+        creators = {
+            user_id: {
+                'user_id': user_id,
+                'picture': picture,
+                'full_name': full_name,
+                'major': major,
+                'year_of_study': year_of_study
+            }
+            for user_id, picture, full_name, major, year_of_study in rows
+        }
+        for item in items:
+            item.creator_info = creators.get(item.user_id)
+
+    @staticmethod
+    def load_skill_requirements(items):
+        """批量加载技能需求及技能类型名称"""
+        by_project = {item.id: item.skill_requirements for item in items}
+        rows = db.session.query(
+            SkillRequirement.id, SkillRequirement.project_id, SkillRequirement.skill_type_id, SkillType.name,
+            SkillRequirement.required_count, SkillRequirement.importance, SkillRequirement.description
+        ).outerjoin(SkillType, SkillType.id == SkillRequirement.skill_type_id).filter(
+            SkillRequirement.project_id.in_(list(by_project))
+        ).order_by(SkillRequirement.id)
+        for requirement_id, project_id, skill_type_id, skill_type_name, required_count, importance, description in rows:
+            by_project[project_id].append({
+                'id': requirement_id,
+                'project_id': project_id,
+                'skill_type_id': skill_type_id,
+                'skill_type_name': skill_type_name,
+                'required_count': required_count,
+                'importance': importance,
+                'description': description
+            })
+
+    @staticmethod
+    def load_skill_type_names(items):
+        """批量加载申请的技能类型名称"""
+        rows = db.session.query(SkillType.id, SkillType.name).filter(
+            SkillType.id.in_({item.skill_type_id for item in items})
+        )
+        names = dict(rows)
+        for item in items:
+            item.skill_type_name = names.get(item.skill_type_id)
+
+    @staticmethod
+    def users(query, fields=None, *extra):
+        """
+        读取用户列表
+        :param query: 已应用过滤条件的用户查询
+        :param fields: 只返回的字段，为None时返回全部字段
+        :param extra: 额外需要查询的列名（不输出）
+        :return: UserListItem 列表
+        """
+        names = ListReader.column_names(UserListItem, User, fields, *extra)
+        query = ListReader._with_columns(query, [getattr(User, name) for name in names])
+        return [UserListItem(names, row) for row in query]
@@ -0,0 +1,130 @@
+import threading
+from flask import current_app
+from app.utils.cache import create_cache
+
+class ProjectDetailCache:
+    """
+    项目详情的读穿透缓存
+
+    以项目ID为键缓存 Project.to_dict() 的结果，项目、技能需求、参与者变化的事务提交后立即失效。
+    后端由 PROJECT_CACHE_BACKEND 配置：memory（默认，进程内LRU+TTL）、redis（多进程共享）或 none。
+    进程内缓存只能失效本进程的条目，多 worker 部署时其他进程的条目最多在 PROJECT_CACHE_TTL 秒后过期。
+
+    每个项目维护一个失效版本号：加载期间发生失效时不写回加载结果，避免把旧数据写入缓存。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._backend = None
+        self._configured = False
+        self._generations = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def _get_backend(self):
+        if not self._configured:
+            with self._lock:
+                if not self._configured:
+                    self._backend = create_cache(current_app.config, 'PROJECT_CACHE')
+                    self._configured = True
+        return self._backend
+
+    @staticmethod
+    def _key(project_id):
+        return f'project:{project_id}'
+
+    def _record_error(self, action):
+        with self._lock:
+            self.errors += 1
+        current_app.logger.exception('项目详情缓存%s失败', action)
+
+    def get_or_load(self, project_id, loader):
+        """
+        读取缓存的项目详情，未命中时调用 loader 加载并写入缓存
+        :param project_id: 项目ID
+        :param loader: 加载项目详情的函数
+        :return: 项目详情字典
+        """
+        backend = self._get_backend()
+        if backend is None:
+            return loader()
+
+        project_id = int(project_id)
+        key = self._key(project_id)
+        try:
+            value = backend.get(key)
+        except Exception:
+            self._record_error('读取')
+            return loader()
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            self.misses += 1
+            generation = self._generations.get(project_id, 0)
+        value = loader()
+        with self._lock:
+            if self._generations.get(project_id, 0) != generation:
+                return value
+            try:
+                backend.set(key, value)
+            except Exception:
+                self._record_error('写入')
+        return value
+
+    def invalidate(self, *project_ids):
+        """
+        使项目详情缓存失效，应在修改项目的事务提交后调用
+        """
+        backend = self._get_backend()
+        if backend is None:
+            return
+        with self._lock:
+            for project_id in map(int, project_ids):
+                self._generations[project_id] = self._generations.get(project_id, 0) + 1
+                self.invalidations += 1
+                try:
+                    backend.delete(self._key(project_id))
+                except Exception:
+                    self._record_error('失效')
+
+    def stats(self):
+        """
+        缓存命中统计
+        :return: 包含后端、命中数、未命中数、命中率、失效次数、条目数的字典
+        """
+        backend = self._get_backend()
+        total = self.hits + self.misses
+        try:
+            size = backend.size() if backend is not None else 0
+        except Exception:
+            size = None
+        return {
+            'backend': type(backend).__name__ if backend is not None else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else None,
+            'invalidations': self.invalidations,
+            'errors': self.errors,
+            'size': size
+        }
+
+    def reset(self):
+        """
+        清空缓存和统计，下次访问时按当前配置重新创建后端
+        """
+        with self._lock:
+            if self._backend is not None:
+                self._backend.clear()
+            self._backend = None
+            self._configured = False
+            self._generations.clear()
+            self.hits = self.misses = self.invalidations = self.errors = 0
+
+
+# 进程级单例
+project_detail_cache = ProjectDetailCache()
@@ -0,0 +1,135 @@
+import threading
+from sqlalchemy import select, bindparam
+from app.models.project import Project, SkillRequirement, ProjectApplication
+from app.services.project_search import ProjectSearchService
+
+
+class ProjectFilterCompiler:
+    """
+    项目列表过滤条件编译器
+
+    项目列表、我创建的项目、我参与的项目共用同一套过滤条件。过滤条件按"形状"（启用了哪些条件、
+    检索方式）构建为 SQLAlchemy 2.0 的 select 语句，条件值全部通过命名绑定参数传入，多值条件使用
+    expanding IN 参数，因此：
+    - 相同形状的语句只构建一次，缓存在进程内，之后的请求只需生成参数字典；
+    - 语句结构不随参数值（包括 IN 列表长度）变化，SQLAlchemy 的编译缓存可以跨请求命中。
+    """
+
+    SCOPE_ALL = 'all'
+    SCOPE_FOUNDER = 'founder'
+    SCOPE_PARTICIPANT = 'participant'
+
+    _lock = threading.Lock()
+    _statements = {}
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def _int(value, name):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'{name}参数必须为整数')
+
+    @classmethod
+    def compile(cls, filters=None, scope=SCOPE_ALL):
+        """
+        编译过滤条件
+        :param filters: 过滤条件字典
+        :param scope: 查询范围，SCOPE_FOUNDER / SCOPE_PARTICIPANT 时按 filters['user_id'] 限定创建者或参与者
+        :return: (select 语句, 绑定参数字典, 相关度表达式或None)
+        """
+        filters = filters or {}
+        params = {}
+
+        if scope != cls.SCOPE_ALL and filters.get('user_id'):
+            params['user_id'] = filters['user_id']
+        if filters.get('project_types'):
+            params['project_types'] = list(filters['project_types'])
+        if filters.get('status'):
+            params['status'] = cls._int(filters['status'], 'status')
+        if filters.get('recruitment_status'):
+            params['recruitment_status'] = cls._int(filters['recruitment_status'], 'recruitment_status')
+        if filters.get('skill_type_ids'):
+            params['skill_type_ids'] = [cls._int(value, 'skill_type_ids') for value in filters['skill_type_ids']]
+        name_mode, keyword_mode, search_params = ProjectSearchService.resolve(filters)
+        params.update(search_params)
+
+        shape = (scope, name_mode, keyword_mode) + tuple(sorted(key for key in params if key not in search_params))
+        cached = cls._statements.get(shape)
+        if cached is not None:
+            with cls._lock:
+                cls.hits += 1
+            return cached[0], params, cached[1]
+
+        statement, relevance = cls._build(scope, params, name_mode, keyword_mode)
+        with cls._lock:
+            cls.misses += 1
+            cls._statements[shape] = (statement, relevance)
+        return statement, params, relevance
+
+    @staticmethod
+    def _build(scope, params, name_mode, keyword_mode):
+        """
+        按过滤条件形状构建 select 语句
+        """
+        conditions = []
+
+        if 'user_id' in params:
+            if scope == ProjectFilterCompiler.SCOPE_FOUNDER:
+                # 项目创建者筛选
+                conditions.append(Project.user_id == bindparam('user_id'))
+            else:
+                # 根据已接受的申请查询用户参与的项目
+                conditions.append(Project.id.in_(
+                    select(ProjectApplication.project_id).where(
+                        ProjectApplication.user_id == bindparam('user_id'),
+                        ProjectApplication.status == ProjectApplication.STATUS_APPROVED
+                    )
+                ))
+
+        # 项目类别筛选（多选）
+        if 'project_types' in params:
+            conditions.append(Project.project_type.in_(bindparam('project_types', expanding=True)))
+
+        # 项目状态筛选
+        if 'status' in params:
+            conditions.append(Project.status == bindparam('status'))
+
+        # 招募状态筛选
+        if 'recruitment_status' in params:
+            conditions.append(Project.recruitment_status == bindparam('recruitment_status'))
+
+        # 所需技能筛选（多选），使用半连接子查询，不需要对结果去重
+        if 'skill_type_ids' in params:
+            conditions.append(Project.id.in_(
+                select(SkillRequirement.project_id).where(
+                    SkillRequirement.skill_type_id.in_(bindparam('skill_type_ids', expanding=True))
+                )
+            ))
+
+        # 项目名称和描述关键词检索
+        search_conditions, relevance = ProjectSearchService.conditions(name_mode, keyword_mode)
+        conditions.extend(search_conditions)
+
+        return select(Project).where(*conditions), relevance
+
+    @classmethod
+    def stats(cls):
+        """
+        语句缓存统计
+        :return: 包含缓存的语句形状数、命中数、未命中数、命中率的字典
+        """
+        total = cls.hits + cls.misses
+        return {
+            'size': len(cls._statements),
+            'hits': cls.hits,
+            'misses': cls.misses,
+            'hit_rate': round(cls.hits / total, 4) if total else None
+        }
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._statements.clear()
+            cls.hits = cls.misses = 0
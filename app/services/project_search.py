@@ -0,0 +1,104 @@
+from app import db
+from app.models.project import Project
+from sqlalchemy import or_, bindparam
+from sqlalchemy.dialects.mysql import match
+
+class ProjectSearchService:
+    """
+    项目名称/关键词检索
+
+    支持两种检索模式：
+    - like: LIKE '%...%' 模糊匹配，兼容所有数据库，但无法使用索引
+    - fulltext: MySQL FULLTEXT 索引（ngram 分词，同时支持中英文），按相关度排序
+
+    非 MySQL 数据库或检索词短于 ngram 分词长度时，fulltext 模式自动退化为 like。
+    """
+
+    SEARCH_MODE_LIKE = 'like'
+    SEARCH_MODE_FULLTEXT = 'fulltext'
+    SEARCH_MODES = (SEARCH_MODE_LIKE, SEARCH_MODE_FULLTEXT)
+
+    # 与 MySQL 默认的 ngram_token_size 保持一致
+    NGRAM_TOKEN_SIZE = 2
+
+    @staticmethod
+    def _fulltext_available(term):
+        """
+        判断检索词能否使用全文索引
+        """
+        return db.engine.dialect.name == 'mysql' and len(term.strip()) >= ProjectSearchService.NGRAM_TOKEN_SIZE
+
+    @staticmethod
+    def _phrase(term):
+        """
+        将检索词转换为布尔模式下的短语查询，去除会被解释为运算符的双引号
+        """
+        return '"' + term.replace('"', ' ').strip() + '"'
+
+    @staticmethod
+    def resolve(filters):
+        """
+        确定名称和关键词的检索方式及绑定参数
+        :param filters: 过滤条件字典，可包含 name、keyword、search_mode
+        :return: (名称检索方式, 关键词检索方式, 绑定参数字典)，未指定检索词时检索方式为None
+        """
+        if not filters:
+            return None, None, {}
+
+        search_mode = filters.get('search_mode') or ProjectSearchService.SEARCH_MODE_LIKE
+        if search_mode not in ProjectSearchService.SEARCH_MODES:
+            raise ValueError(f"search_mode参数无效，可选值: {', '.join(ProjectSearchService.SEARCH_MODES)}")
+
+        modes = []
+        params = {}
+        for field in ('name', 'keyword'):
+            term = filters.get(field)
+            if not term:
+                modes.append(None)
+            elif search_mode == ProjectSearchService.SEARCH_MODE_FULLTEXT and ProjectSearchService._fulltext_available(term):
+                modes.append(ProjectSearchService.SEARCH_MODE_FULLTEXT)
+                params[f'{field}_against'] = ProjectSearchService._phrase(term)
+            else:
+                modes.append(ProjectSearchService.SEARCH_MODE_LIKE)
+                params[f'{field}_pattern'] = f"%{term}%"
+        return modes[0], modes[1], params
+
+    @staticmethod
+    def conditions(name_mode, keyword_mode):
+        """
+        构建检索条件，检索词通过 resolve 返回的命名绑定参数传入，
+        检索方式相同的查询语句结构相同，可复用编译缓存
+        :param name_mode: 名称检索方式
+        :param keyword_mode: 关键词检索方式
+        :return: (条件列表, 相关度表达式或None)
+        """
+        conditions = []
+        relevance_parts = []
+
+        # 项目名称筛选
+        if name_mode == ProjectSearchService.SEARCH_MODE_FULLTEXT:
+            name_match = match(Project.name, against=bindparam('name_against')).in_boolean_mode()
+            conditions.append(name_match)
+            relevance_parts.append(name_match)
+        elif name_mode == ProjectSearchService.SEARCH_MODE_LIKE:
+            conditions.append(Project.name.like(bindparam('name_pattern')))
+
+        # 描述关键词筛选
+        if keyword_mode == ProjectSearchService.SEARCH_MODE_FULLTEXT:
+            content_match = match(Project.description, Project.goal, against=bindparam('keyword_against')).in_boolean_mode()
+            conditions.append(content_match)
+            relevance_parts.append(content_match)
+        elif keyword_mode == ProjectSearchService.SEARCH_MODE_LIKE:
+            keyword = bindparam('keyword_pattern')
+            conditions.append(or_(
+                Project.description.like(keyword),
+                Project.goal.like(keyword)
+            ))
+
+        if not relevance_parts:
+            return conditions, None
+
+        relevance = relevance_parts[0]
+        for part in relevance_parts[1:]:
+            relevance = relevance + part
+        return conditions, relevance.label('relevance')
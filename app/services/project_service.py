@@ -1,20 +1,50 @@
 from app import db
-from app.models.project import Project, SkillRequirement, SkillType, ProjectApplication, ProjectDeliverable, DeliverableConfirmation
+from app.models.project import Project, SkillRequirement, SkillType, ProjectApplication, ProjectDeliverable, DeliverableConfirmation, ProjectProgress
 from datetime import datetime
-from sqlalchemy import or_, and_
+from sqlalchemy import and_
 from werkzeug.utils import secure_filename
-import os
-from flask import current_app
+from app.services.file_storage import FileStorageService
+from app.services.job_queue import JobQueue
+from app.services.thumbnail_service import ThumbnailService
+from app.services.project_filters import ProjectFilterCompiler
+from app.services.skill_type_catalog import skill_type_catalog
+from app.services.project_cache import project_detail_cache
+from app.services.list_reader import ListReader
+from app.utils.pagination import KeysetPaginator
+
+# 项目列表游标分页，支持的排序字段
+project_paginator = KeysetPaginator(Project, {
+    'created_at': Project.created_at,
+    'updated_at': Project.updated_at,
+    'end_time': Project.end_time,
+    'id': Project.id,
+    'relevance': None
+})
+
+# 交付物列表游标分页，默认按上传时间正序
+deliverable_paginator = KeysetPaginator(ProjectDeliverable, {
+    'created_at': ProjectDeliverable.created_at,
+    'updated_at': ProjectDeliverable.updated_at,
+    'id': ProjectDeliverable.id
+}, default_order='asc')
 
 class SkillTypeService:
     @staticmethod
     def get_all_skill_types():
         """
-        获取所有技能类型
+        获取所有技能类型（读取进程内缓存）
         :return: 技能类型列表
         """
-        skill_types = SkillType.query.all()
-        return [skill_type.to_dict() for skill_type in skill_types]
+        skill_types, _ = skill_type_catalog.get_all()
+        return skill_types
+    
+    @staticmethod
+    def get_all_skill_types_with_etag():
+        """
+        获取所有技能类型及其版本对应的ETag
+        :return: (技能类型列表, ETag)
+        """
+        return skill_type_catalog.get_all()
     
     @staticmethod
     def get_skill_type_by_id(skill_type_id):
@@ -25,6 +55,92 @@ class SkillTypeService:
         """
         return SkillType.query.get_or_404(skill_type_id)
     
+    @staticmethod
+    def get_existing_skill_type_ids(skill_type_ids):
+        """
+        批量查询存在的技能类型ID
+        先查技能类型目录缓存，缓存中没有的ID（如其他进程刚创建、缓存尚未刷新）再用一条IN查询确认
+        :param skill_type_ids: 技能类型ID集合
+        :return: 存在的技能类型ID集合
+        """
+        existing = {skill_type_id for skill_type_id in set(skill_type_ids) if skill_type_catalog.get_by_id(skill_type_id)}
+        missing = set(skill_type_ids) - existing
+        if missing:
+            rows = db.session.query(SkillType.id).filter(SkillType.id.in_(missing)).all()
+            existing.update(row.id for row in rows)
+        return existing
+    
+    @staticmethod
+    def _parse_int(value):
+        """
+        将整数或数字字符串（如 "3"）转换为整数
+        :return: 整数，无法转换时返回None
+        """
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, int):
+            return value
+        if isinstance(value, str):
+            try:
+                return int(value.strip())
+            except ValueError:
+                return None
+        return None
+    
+    @staticmethod
+    def validate_skill_requirements(skill_requirements):
+        """
+        批量校验技能需求数据
+        
+        先逐条校验必填字段和取值范围，再通过技能类型目录（必要时一条IN查询）校验所有引用的技能类型ID，
+        一次性返回所有错误，可供创建、更新项目及批量导入复用。
+        与原有接口兼容，skill_type_id、importance 接受数字字符串，校验通过后在原字典中转换为整数。
+        :param skill_requirements: 技能需求字典列表
+        :return: 错误信息列表，为空表示校验通过
+        """
+        if not isinstance(skill_requirements, list):
+            return ['skill_requirements必须是数组']
+        
+        errors = []
+        # 技能类型ID -> 引用该ID的技能需求序号列表
+        referenced = {}
+        required_skill_fields = ['skill_type_id', 'required_count', 'importance']
+        for i, skill in enumerate(skill_requirements):
+            if not isinstance(skill, dict):
+                errors.append((i, f'第{i+1}个技能需求格式无效'))
+                continue
+            
+            missing = [field for field in required_skill_fields if field not in skill]
+            if missing:
+                errors.append((i, f"第{i+1}个技能需求缺少必填字段: {', '.join(missing)}"))
+                continue
+            
+            # 验证重要程度是否在1-5范围
+            importance = SkillTypeService._parse_int(skill['importance'])
+            if importance is None:
+                errors.append((i, f'第{i+1}个技能需求的重要程度必须为整数'))
+            elif not (1 <= importance <= 5):
+                errors.append((i, f'第{i+1}个技能需求的重要程度必须在1-5之间'))
+            else:
+                skill['importance'] = importance
+            
+            skill_type_id = SkillTypeService._parse_int(skill['skill_type_id'])
+            if skill_type_id is None:
+                errors.append((i, f'第{i+1}个技能需求的技能类型ID必须为整数'))
+                continue
+            skill['skill_type_id'] = skill_type_id
+            referenced.setdefault(skill_type_id, []).append(i)
+        
+        # 验证技能类型ID是否存在
+        existing_ids = SkillTypeService.get_existing_skill_type_ids(referenced.keys())
+        for skill_type_id, indexes in referenced.items():
+            if skill_type_id not in existing_ids:
+                for i in indexes:
+                    errors.append((i, f'第{i+1}个技能需求的技能类型ID不存在'))
+        
+        # 按技能需求序号排序后返回
+        return [message for _, message in sorted(errors, key=lambda error: error[0])]
+    
     @staticmethod
     def create_skill_type(data):
         """
@@ -38,6 +154,7 @@ class SkillTypeService:
         )
         db.session.add(skill_type)
         db.session.commit()
+        skill_type_catalog.invalidate()
         return skill_type
 
 class ProjectService:
@@ -77,170 +194,96 @@ class ProjectService:
         
         # 保存到数据库
         db.session.add(project)
+        db.session.flush()
+        
+        # 初始化项目进度计数
+        db.session.add(ProjectProgress(
+            project_id=project.id,
+            reviewed_deliverables=0,
+            participants=0,
+            confirmations_received=0,
+            pending_applications=0,
+            approved_applications=0
+        ))
         db.session.commit()
         
         return project
     
     @staticmethod
-    def get_project_list(filters=None):
+    def get_project_list(filters=None, pagination=None, fields=None):
         """
         获取项目列表，支持多种过滤条件
         :param filters: 过滤条件字典
-        :return: 项目列表
+        :param pagination: 游标分页参数，为None时返回全部结果
+        :param fields: 只返回的字段，为None时返回全部字段
+        :return: 包含 items、next_cursor、total 的字典
         """
-        query = Project.query
-        
-        if filters:
-            # 项目名称筛选
-            if 'name' in filters and filters['name']:
-                query = query.filter(Project.name.like(f"%{filters['name']}%"))
-            
-            # 项目类别筛选（多选）
-            if 'project_types' in filters and filters['project_types']:
-                query = query.filter(Project.project_type.in_(filters['project_types']))
-            
-            # 项目状态筛选
-            if 'status' in filters and filters['status']:
-                status_value = int(filters['status'])
-                query = query.filter(Project.status == status_value)
-            
-            # 招募状态筛选
-            if 'recruitment_status' in filters and filters['recruitment_status']:
-                recruitment_status_value = int(filters['recruitment_status'])
-                query = query.filter(Project.recruitment_status == recruitment_status_value)
-            
-            # 所需技能筛选（多选）
-            if 'skill_type_ids' in filters and filters['skill_type_ids']:
-                skill_ids = [int(id) for id in filters['skill_type_ids']]
-                skill_filter = or_(*[SkillRequirement.skill_type_id == skill_id for skill_id in skill_ids])
-                query = query.join(SkillRequirement).filter(skill_filter).distinct()
-            
-            # 描述关键词筛选
-            if 'keyword' in filters and filters['keyword']:
-                keyword = f"%{filters['keyword']}%"
-                query = query.filter(or_(
-                    Project.description.like(keyword),
-                    Project.goal.like(keyword)
-                ))
-                
-        # 返回项目列表
-        projects = query.all()
-        return [
-            {k: v for k, v in project.to_dict().items() if k != 'recent_participants'}
-            for project in projects
-        ]
+        return ProjectService._read_project_list(filters, pagination, fields, ProjectFilterCompiler.SCOPE_ALL)
 
     @staticmethod
-    def get_founder_project_list(filters=None):
+    def _read_project_list(filters, pagination, fields, scope, include_recent_participants=False):
         """
-        获取项目列表，支持多种过滤条件
-        :param filters: 过滤条件字典
-        :return: 项目列表
+        按过滤条件读取项目列表（只读列查询，不加载ORM实体）
+        :param scope: 查询范围，见 ProjectFilterCompiler
+        """
+        statement, params, relevance = ProjectFilterCompiler.compile(filters, scope)
+        items, next_cursor, total = ListReader.projects(
+            statement, project_paginator, pagination, {'relevance': relevance}, fields,
+            include_recent_participants=include_recent_participants, params=params
+        )
+        return {
+            'items': items,
+            'next_cursor': next_cursor,
+            'total': total
+        }
+
+    @staticmethod
+    def get_project_list_version(filters=None):
         """
-        query = Project.query
+        项目列表的版本信息，用于生成ETag（只执行聚合查询，不加载项目）
         
-        if filters:
-            # 项目创建者筛选
-            if 'user_id' in filters and filters['user_id']:
-                query = query.filter(Project.user_id == filters['user_id'])
+        符合条件的项目数、最近更新时间和行版本号之和（同一秒内的多次修改也会改变版本），
+        加上技能需求表的行数/最大ID（修改技能需求会删除并重建记录）
+        和技能类型目录的版本；用户信息创建后不再修改，不计入版本。
+        :param filters: 过滤条件字典
+        :return: 版本信息元组
+        """
+        statement, params, _ = ProjectFilterCompiler.compile(filters)
+        count, max_updated_at, version_sum = db.session.execute(statement.with_only_columns(
+            db.func.count(Project.id),
+            db.func.max(Project.updated_at),
+            db.func.sum(Project.row_version)
+        ), params).one()
+        requirement_count, requirement_max_id = db.session.query(
+            db.func.count(SkillRequirement.id),
+            db.func.max(SkillRequirement.id)
+        ).one()
+        _, skill_type_etag = skill_type_catalog.get_all()
+        return count, max_updated_at, version_sum, requirement_count, requirement_max_id, skill_type_etag
 
-            # 项目名称筛选
-            if 'name' in filters and filters['name']:
-                query = query.filter(Project.name.like(f"%{filters['name']}%"))
-            
-            # 项目类别筛选（多选）
-            if 'project_types' in filters and filters['project_types']:
-                query = query.filter(Project.project_type.in_(filters['project_types']))
-            
-            # 项目状态筛选
-            if 'status' in filters and filters['status']:
-                status_value = int(filters['status'])
-                query = query.filter(Project.status == status_value)
-            
-            # 招募状态筛选
-            if 'recruitment_status' in filters and filters['recruitment_status']:
-                recruitment_status_value = int(filters['recruitment_status'])
-                query = query.filter(Project.recruitment_status == recruitment_status_value)
-            
-            # 所需技能筛选（多选）
-            if 'skill_type_ids' in filters and filters['skill_type_ids']:
-                skill_ids = [int(id) for id in filters['skill_type_ids']]
-                skill_filter = or_(*[SkillRequirement.skill_type_id == skill_id for skill_id in skill_ids])
-                query = query.join(SkillRequirement).filter(skill_filter).distinct()
-            
-            # 描述关键词筛选
-            if 'keyword' in filters and filters['keyword']:
-                keyword = f"%{filters['keyword']}%"
-                query = query.filter(or_(
-                    Project.description.like(keyword),
-                    Project.goal.like(keyword)
-                ))
-                
-        # 返回项目列表
-        projects = query.all()
-        return [project.to_dict() for project in projects]
+    @staticmethod
+    def get_founder_project_list(filters=None, pagination=None, fields=None):
+        """
+        获取用户创建的项目列表，支持多种过滤条件
+        :param filters: 过滤条件字典，user_id 为创建者
+        :param pagination: 游标分页参数，为None时返回全部结果
+        :param fields: 只返回的字段，为None时返回全部字段
+        :return: 包含 items、next_cursor、total 的字典
+        """
+        return ProjectService._read_project_list(
+            filters, pagination, fields, ProjectFilterCompiler.SCOPE_FOUNDER, include_recent_participants=True
+        )
     
     @staticmethod
-    def get_participant_project_list(filters=None):
+    def get_participant_project_list(filters=None, pagination=None, fields=None):
         """
         获取用户参与的项目列表，支持多种过滤条件
-        :param filters: 过滤条件字典
-        :return: 项目列表
-        """
-        query = Project.query
-        
-        if filters:
-            # 项目参与者筛选
-            if 'user_id' in filters and filters['user_id']:
-                # 根据已接受的申请查询用户参与的项目
-                user_id = filters['user_id']
-                # 通过子查询获取用户已接受申请的项目ID
-                approved_project_ids = db.session.query(ProjectApplication.project_id).filter(
-                    ProjectApplication.user_id == user_id,
-                    ProjectApplication.status == ProjectApplication.STATUS_APPROVED
-                ).distinct().subquery()
-                
-                # 使用子查询结果过滤项目
-                query = query.filter(Project.id.in_(approved_project_ids))
-
-            # 项目名称筛选
-            if 'name' in filters and filters['name']:
-                query = query.filter(Project.name.like(f"%{filters['name']}%"))
-            
-            # 项目类别筛选（多选）
-            if 'project_types' in filters and filters['project_types']:
-                query = query.filter(Project.project_type.in_(filters['project_types']))
-            
-            # 项目状态筛选
-            if 'status' in filters and filters['status']:
-                status_value = int(filters['status'])
-                query = query.filter(Project.status == status_value)
-            
-            # 招募状态筛选
-            if 'recruitment_status' in filters and filters['recruitment_status']:
-                recruitment_status_value = int(filters['recruitment_status'])
-                query = query.filter(Project.recruitment_status == recruitment_status_value)
-            
-            # 所需技能筛选（多选）
-            if 'skill_type_ids' in filters and filters['skill_type_ids']:
-                skill_ids = [int(id) for id in filters['skill_type_ids']]
-                skill_filter = or_(*[SkillRequirement.skill_type_id == skill_id for skill_id in skill_ids])
-                query = query.join(SkillRequirement).filter(skill_filter).distinct()
-            
-            # 描述关键词筛选
-            if 'keyword' in filters and filters['keyword']:
-                keyword = f"%{filters['keyword']}%"
-                query = query.filter(or_(
-                    Project.description.like(keyword),
-                    Project.goal.like(keyword)
-                ))
-                
-        # 返回项目列表
-        projects = query.all()
-        return [
-            {k: v for k, v in project.to_dict().items() if k != 'recent_participants'}
-            for project in projects
-        ]
+        :param filters: 过滤条件字典，user_id 为参与者
+        :param pagination: 游标分页参数，为None时返回全部结果
+        :param fields: 只返回的字段，为None时返回全部字段
+        :return: 包含 items、next_cursor、total 的字典
+        """
+        return ProjectService._read_project_list(filters, pagination, fields, ProjectFilterCompiler.SCOPE_PARTICIPANT)
     
     @staticmethod
     def get_project_detail(project_id):
@@ -249,8 +292,9 @@ class ProjectService:
         :param project_id: 项目ID
         :return: 项目详情
         """
-        project = Project.query.get_or_404(project_id)
-        return project.to_dict()
+        return project_detail_cache.get_or_load(
+            project_id, lambda: Project.query.get_or_404(project_id).to_dict()
+        )
 
     @staticmethod
     def update_project(project_id, data, user_id):
@@ -301,6 +345,7 @@ class ProjectService:
                 project.skill_requirements.append(skill)
         
         db.session.commit()
+        project_detail_cache.invalidate(project_id)
         return project
 
     @staticmethod
@@ -321,9 +366,23 @@ class ProjectService:
         # 删除项目相关的所有申请记录
         ProjectApplication.query.filter_by(project_id=project_id).delete()
         
+        # 删除交付物及其确认记录，释放交付物文件引用（引用归零的文件由后台任务删除）
+        file_hashes = db.session.query(ProjectDeliverable.file_hash).filter(
+            ProjectDeliverable.project_id == project_id,
+            ProjectDeliverable.file_hash.isnot(None)
+        ).all()
+        DeliverableConfirmation.query.filter_by(project_id=project_id).delete(synchronize_session=False)
+        ProjectDeliverable.query.filter_by(project_id=project_id).delete(synchronize_session=False)
+        for (file_hash,) in file_hashes:
+            FileStorageService.release(file_hash)
+        
+        # 删除项目进度计数
+        ProjectProgress.query.filter_by(project_id=project_id).delete()
+        
         # 删除项目
         db.session.delete(project)
         db.session.commit()
+        project_detail_cache.invalidate(project_id)
         
         return {"success": True, "message": "项目已成功删除"}
 
@@ -367,7 +426,10 @@ class ProjectApplicationService:
         )
         
         db.session.add(application)
+        db.session.flush()
+        ProjectProgressService.adjust(application.project_id, pending_applications=1)
         db.session.commit()
+        project_detail_cache.invalidate(application.project_id)
         
         return application
     
@@ -393,14 +455,142 @@ class ProjectApplicationService:
         if user_id and project.user_id != user_id:
             raise ValueError("您不是项目负责人，无权处理该申请")
         
+        # 锁定计数行，使同一项目的计数维护串行执行
+        ProjectProgressService.get(application.project_id, for_update=True)
+        was_participant = ProjectProgressService.is_participant(
+            application.project_id, application.user_id, exclude_application_id=application.id
+        )
+        
         # 更新申请状态
         application.status = status
         application.response_message = response_message
+        db.session.flush()
         
-        db.session.commit()
+        # 更新项目计数
+        deltas = {'pending_applications': -1}
+        if status == ProjectApplication.STATUS_APPROVED:
+            deltas['approved_applications'] = 1
+            if not was_participant:
+                deltas['participants'] = 1
+                deltas['confirmations_received'] = ProjectProgressService._participant_confirmation_count(
+                    application.project_id, application.user_id, for_update=True
+                )
+        ProjectProgressService.adjust(application.project_id, **deltas)
         
+        db.session.commit()
+        project_detail_cache.invalidate(application.project_id)
+
         return application
-    
+
+    @staticmethod
+    def process_applications_bulk(application_ids, status, response_message=None, user_id=None):
+        """
+        批量处理项目申请
+
+        一次查询取出全部申请及其项目负责人完成权限校验，可处理的申请在同一事务内用一条
+        UPDATE ... WHERE id IN (...) AND status = 待处理 更新，项目计数按项目汇总后各更新一次。
+        不存在、无权处理或已处理的申请不影响其他申请，在结果中逐条返回原因。
+        :param application_ids: 申请ID列表
+        :param status: 处理状态 (2-接受, 3-拒绝)
+        :param response_message: 回复消息
+        :param user_id: 处理人ID (必须是项目创建者)
+        :return: (按申请ID顺序的处理结果列表, 统计字典)
+        """
+        application_ids = list(dict.fromkeys(application_ids))
+        rows = db.session.query(
+            ProjectApplication.id, ProjectApplication.project_id, ProjectApplication.user_id,
+            ProjectApplication.status, Project.user_id
+        ).join(Project, Project.id == ProjectApplication.project_id).filter(
+            ProjectApplication.id.in_(application_ids)
+        ).all()
+        found = {row[0]: row for row in rows}
+
+        errors = {}
+        accepted = {}
+        for application_id in application_ids:
+            row = found.get(application_id)
+            if row is None:
+                errors[application_id] = "申请不存在"
+            elif user_id and row[4] != user_id:
+                errors[application_id] = "您不是项目负责人，无权处理该申请"
+            else:
+                accepted[application_id] = row
+
+        project_ids = sorted({row[1] for row in accepted.values()})
+        if project_ids:
+            # 按项目ID顺序锁定计数行，与单条处理一样使同一项目的计数维护串行执行
+            for project_id in project_ids:
+                ProjectProgressService.get(project_id, for_update=True)
+            # 加锁后重新读取状态，排除已被其他请求处理的申请
+            current_status = dict(db.session.query(ProjectApplication.id, ProjectApplication.status).filter(
+                ProjectApplication.id.in_(list(accepted))
+            ).with_for_update(read=True).all())
+            for application_id in list(accepted):
+                if current_status.get(application_id) != ProjectApplication.STATUS_PENDING:
+                    errors[application_id] = "该申请已处理，不能重复处理"
+                    del accepted[application_id]
+
+        if accepted:
+            by_project = {}
+            for application_id, project_id, applicant_id, _, _ in accepted.values():
+                by_project.setdefault(project_id, []).append(applicant_id)
+
+            new_participants = {}
+            confirmations = {}
+            if status == ProjectApplication.STATUS_APPROVED:
+                existing = set(db.session.query(ProjectApplication.project_id, ProjectApplication.user_id).filter(
+                    ProjectApplication.project_id.in_(list(by_project)),
+                    ProjectApplication.user_id.in_({applicant for applicants in by_project.values() for applicant in applicants}),
+                    ProjectApplication.status == ProjectApplication.STATUS_APPROVED
+                ).with_for_update(read=True).all())
+                for project_id, applicants in by_project.items():
+                    new_participants[project_id] = {
+                        applicant for applicant in applicants if (project_id, applicant) not in existing
+                    }
+                confirmations = ProjectProgressService._participant_confirmation_counts(new_participants)
+
+            updated = ProjectApplication.query.filter(
+                ProjectApplication.id.in_(list(accepted)),
+                ProjectApplication.status == ProjectApplication.STATUS_PENDING
+            ).update({
+                ProjectApplication.status: status,
+                ProjectApplication.response_message: response_message,
+                ProjectApplication.updated_at: datetime.now()
+            }, synchronize_session=False)
+            if updated != len(accepted):
+                db.session.rollback()
+                raise ValueError("部分申请的状态已变化，请刷新后重试")
+
+            for project_id, applicants in by_project.items():
+                deltas = {'pending_applications': -len(applicants)}
+                if status == ProjectApplication.STATUS_APPROVED:
+                    deltas['approved_applications'] = len(applicants)
+                    deltas['participants'] = len(new_participants[project_id])
+                    deltas['confirmations_received'] = confirmations.get(project_id, 0)
+                ProjectProgressService.adjust(project_id, **deltas)
+
+            db.session.commit()
+            for project_id in by_project:
+                project_detail_cache.invalidate(project_id)
+
+        results = []
+        for application_id in application_ids:
+            if application_id in accepted:
+                results.append({
+                    'id': application_id,
+                    'success': True,
+                    'project_id': accepted[application_id][1],
+                    'status': status
+                })
+            else:
+                results.append({'id': application_id, 'success': False, 'error': errors[application_id]})
+        summary = {
+            'total': len(application_ids),
+            'processed': len(accepted),
+            'failed': len(application_ids) - len(accepted)
+        }
+        return results, summary
+
     @staticmethod
     def get_my_applications(user_id):
         """
@@ -414,6 +604,53 @@ class ProjectApplicationService:
         
         return [application.to_dict() for application in applications]
     
+    @staticmethod
+    def get_my_applications_version(user_id):
+        """
+        用户申请列表的版本信息，用于生成ETag（只执行聚合查询）
+        申请列表包含项目名称、类型，因此同时计入相关项目的最近更新时间；
+        行版本号之和使同一秒内的多次修改也会改变版本
+        :param user_id: 用户ID
+        :return: 版本信息元组
+        """
+        count, max_updated_at, version_sum, project_max_updated_at, project_version_sum = db.session.query(
+            db.func.count(ProjectApplication.id),
+            db.func.max(ProjectApplication.updated_at),
+            db.func.sum(ProjectApplication.row_version),
+            db.func.max(Project.updated_at),
+            db.func.sum(Project.row_version)
+        ).join(Project, Project.id == ProjectApplication.project_id).filter(
+            ProjectApplication.user_id == user_id
+        ).one()
+        _, skill_type_etag = skill_type_catalog.get_all()
+        return count, max_updated_at, version_sum, project_max_updated_at, project_version_sum, skill_type_etag
+    
+    @staticmethod
+    def get_project_applications_version(project_id):
+        """
+        项目待处理申请列表的版本信息，用于生成ETag
+        由 (project_id, status, updated_at) 索引定位该项目的待处理申请，行版本号之和使同一秒内的多次修改也会改变版本；
+        申请列表包含项目名称、类型，因此同时计入项目的更新时间和行版本号
+        :param project_id: 项目ID
+        :return: 版本信息元组，项目不存在时返回None
+        """
+        row = db.session.query(
+            Project.updated_at,
+            Project.row_version,
+            db.func.count(ProjectApplication.id),
+            db.func.max(ProjectApplication.updated_at),
+            db.func.sum(ProjectApplication.row_version)
+        ).outerjoin(ProjectApplication, db.and_(
+            ProjectApplication.project_id == Project.id,
+            ProjectApplication.status == ProjectApplication.STATUS_PENDING
+        )).filter(
+            Project.id == project_id
+        ).group_by(Project.id, Project.updated_at, Project.row_version).first()
+        if row is None:
+            return None
+        _, skill_type_etag = skill_type_catalog.get_all()
+        return tuple(row) + (skill_type_etag,)
+    
     @staticmethod
     def get_project_applications(project_id):
         """
@@ -484,9 +721,23 @@ class ProjectApplicationService:
         if not application:
             raise ValueError("该用户不是项目参与者或未找到相关申请记录")
         
+        # 锁定计数行，使同一项目的计数维护串行执行
+        ProjectProgressService.get(project.id, for_update=True)
+        
         # 删除申请记录
         db.session.delete(application)
+        db.session.flush()
+        
+        # 更新项目计数：用户不再有已接受的申请时，其确认不再计入
+        deltas = {'approved_applications': -1}
+        if not ProjectProgressService.is_participant(project.id, participant_user_id):
+            deltas['participants'] = -1
+            deltas['confirmations_received'] = -ProjectProgressService._participant_confirmation_count(
+                project.id, participant_user_id, for_update=True
+            )
+        ProjectProgressService.adjust(project.id, **deltas)
         db.session.commit()
+        project_detail_cache.invalidate(project.id)
         
         return {"success": True, "message": "已成功移除项目参与者"}
 
@@ -514,26 +765,66 @@ class ProjectDeliverableService:
             link_url=data.get('link_url'),
             status=data.get('status', ProjectDeliverable.STATUS_DRAFT)  
         )
-        # 文件上传处理
+        # 文件上传处理：分块流式保存并按内容哈希去重
         if file:
-            filename = secure_filename(file.filename)
-            # 使用绝对路径
-            upload_folder = os.path.join(current_app.root_path, 'static', 'deliverables',str(project_id))
-            os.makedirs(upload_folder, exist_ok=True)
-            file_path = os.path.join(upload_folder, filename)
-            file.save(file_path)
-            # 存储相对URL路径
-            deliverable.file_url = f'/api/static/deliverables/{project_id}/{filename}'
-            deliverable.file_name = filename
-            deliverable.file_size = os.path.getsize(file_path)
+            stored_file = FileStorageService.store(file)
+            deliverable.file_hash = stored_file.sha256
+            deliverable.file_name = secure_filename(file.filename)
+            deliverable.file_size = stored_file.size
         db.session.add(deliverable)
+        db.session.flush()
+        if file:
+            # 文件通过交付物ID下载
+            deliverable.file_url = f'/api/static/deliverables?deliverable_id={deliverable.id}'
+            # 图片交付物由后台任务生成缩略图和预览图
+            ThumbnailService.schedule(deliverable)
         db.session.commit()
         return deliverable
 
     @staticmethod
-    def get_deliverables_by_project(project_id):
-        """获取项目的所有交付物"""
-        return [d.to_dict() for d in ProjectDeliverable.query.filter_by(project_id=project_id).order_by(ProjectDeliverable.created_at).all()]
+    def get_deliverables_by_project(project_id, user_id=None, status=None, pagination=None):
+        """
+        获取项目的交付物列表
+        
+        指定 user_id 时通过一次 LEFT JOIN deliverable_confirmations（uq_deliverable_user 唯一键）
+        同时返回该用户对每个交付物的确认状态。
+        :param project_id: 项目ID
+        :param user_id: 用户ID（可选），用于返回确认状态
+        :param status: 交付物状态筛选（可选）
+        :param pagination: 游标分页参数，为None时返回全部结果
+        :return: 包含 items、next_cursor、total 的字典
+        """
+        if user_id:
+            query = db.session.query(ProjectDeliverable, DeliverableConfirmation.confirmed).outerjoin(
+                DeliverableConfirmation,
+                and_(
+                    DeliverableConfirmation.deliverable_id == ProjectDeliverable.id,
+                    DeliverableConfirmation.user_id == user_id
+                )
+            )
+        else:
+            query = ProjectDeliverable.query
+        
+        query = query.filter(ProjectDeliverable.project_id == project_id)
+        if status is not None:
+            query = query.filter(ProjectDeliverable.status == status)
+        
+        if pagination:
+            rows, next_cursor, total = deliverable_paginator.paginate(query, pagination)
+        else:
+            rows = query.order_by(ProjectDeliverable.created_at, ProjectDeliverable.id).all()
+            next_cursor, total = None, len(rows)
+        
+        items = []
+        for row in rows:
+            if user_id:
+                deliverable, confirmed = row
+                data = deliverable.to_dict()
+                data['confirmed'] = bool(confirmed)
+            else:
+                data = row.to_dict()
+            items.append(data)
+        return {'items': items, 'next_cursor': next_cursor, 'total': total}
 
     @staticmethod
     def delete_deliverable(deliverable_id, uploader_id):
@@ -541,7 +832,20 @@ class ProjectDeliverableService:
         deliverable = ProjectDeliverable.query.get_or_404(deliverable_id)
         if deliverable.uploader_id != uploader_id:
             raise ValueError('无权删除该交付物')
+        deltas = {}
+        if deliverable.status == ProjectDeliverable.STATUS_REVIEWED:
+            ProjectProgressService.get(deliverable.project_id, for_update=True)
+            deltas = {
+                'reviewed_deliverables': -1,
+                'confirmations_received': -ProjectProgressService._deliverable_confirmation_count(deliverable)
+            }
+        project_id = deliverable.project_id
+        file_hash = deliverable.file_hash
         db.session.delete(deliverable)
+        db.session.flush()
+        ProjectProgressService.adjust(project_id, **deltas)
+        # 释放文件引用，引用归零的文件由后台任务删除
+        FileStorageService.release(file_hash)
         db.session.commit()
         return True
 
@@ -549,7 +853,28 @@ class ProjectDeliverableService:
     def update_status(deliverable_id, status, reviewer_id=None):
         """更新交付物状态（如提交、审核）"""
         deliverable = ProjectDeliverable.query.get_or_404(deliverable_id)
+        old_status = deliverable.status
         deliverable.status = status
+        db.session.flush()
+        
+        # 进入或离开已审核状态时，同步已审核交付物数及其确认数
+        was_reviewed = old_status == ProjectDeliverable.STATUS_REVIEWED
+        is_reviewed = status == ProjectDeliverable.STATUS_REVIEWED
+        if was_reviewed != is_reviewed:
+            ProjectProgressService.get(deliverable.project_id, for_update=True)
+            sign = 1 if is_reviewed else -1
+            ProjectProgressService.adjust(
+                deliverable.project_id,
+                reviewed_deliverables=sign,
+                confirmations_received=sign * ProjectProgressService._deliverable_confirmation_count(deliverable)
+            )
+        if is_reviewed:
+            # 由后台任务检查项目是否所有交付物均已审核
+            JobQueue.enqueue(
+                'project.check_completion',
+                {'project_id': deliverable.project_id},
+                dedupe_key=f'project.check_completion:{deliverable.project_id}'
+            )
         db.session.commit()
         return deliverable
 
@@ -563,6 +888,7 @@ class ProjectDeliverableService:
             if project and project.status != Project.STATUS_COMPLETED:
                 project.status = Project.STATUS_COMPLETED
                 db.session.commit()
+                project_detail_cache.invalidate(project_id)
                 return True
         return False
 
@@ -575,9 +901,13 @@ class DeliverableConfirmationService:
         if deliverable.status != ProjectDeliverable.STATUS_REVIEWED:
             raise ValueError('交付物未审核，无法确认')
         project_id = deliverable.project_id
+        # 先锁定项目行，使同一项目的确认操作串行执行（须在插入确认记录之前加锁，
+        # 否则插入时外键检查持有的共享锁会与随后的排他锁互相等待造成死锁）
+        DeliverableConfirmationService._lock_project(project_id)
         # 检查是否已确认
         existing = DeliverableConfirmation.query.filter_by(deliverable_id=deliverable_id, user_id=user_id).first()
         if existing:
+            db.session.commit()
             return existing
         confirmation = DeliverableConfirmation(
             project_id=project_id,
@@ -586,8 +916,26 @@ class DeliverableConfirmationService:
             confirmed=True
         )
         db.session.add(confirmation)
+        db.session.flush()
+        # 仅项目参与者的确认计入项目进度
+        if ProjectProgressService.is_participant(project_id, user_id):
+            ProjectProgressService.adjust(project_id, confirmations_received=1)
+            # 由后台任务检查项目是否可自动完成
+            JobQueue.enqueue(
+                'project.complete_by_confirmation',
+                {'project_id': project_id},
+                dedupe_key=f'project.complete_by_confirmation:{project_id}'
+            )
         db.session.commit()
         return confirmation
+    
+    @staticmethod
+    def _lock_project(project_id):
+        """
+        以 SELECT ... FOR UPDATE 锁定项目行
+        :return: 项目对象，不存在时返回None
+        """
+        return Project.query.filter_by(id=project_id).with_for_update().first()
 
     @staticmethod
     def get_deliverable_confirm_status(deliverable_id, user_id):
@@ -596,32 +944,247 @@ class DeliverableConfirmationService:
 
     @staticmethod
     def get_project_confirm_status(project_id, user_id):
-        from app.models.project import ProjectDeliverable
-        deliverables = ProjectDeliverable.query.filter_by(project_id=project_id, status=ProjectDeliverable.STATUS_REVIEWED).all()
-        if not deliverables:
+        # 已审核交付物数直接读取项目进度计数；只读接口不重建计数行，项目不存在时返回空结果
+        try:
+            project_id = int(project_id)
+        except (TypeError, ValueError):
             return {'all_confirmed': False, 'total': 0, 'confirmed_count': 0}
-        total = len(deliverables)
-        confirmed_count = DeliverableConfirmation.query.filter_by(project_id=project_id, user_id=user_id, confirmed=True).filter(DeliverableConfirmation.deliverable_id.in_([d.id for d in deliverables])).count()
+        progress = db.session.get(ProjectProgress, project_id)
+        if progress is not None:
+            total = progress.reviewed_deliverables
+        elif db.session.get(Project, project_id) is not None:
+            # 计数行缺失（如历史项目）时按源表计算，不写入
+            total = ProjectProgressService.compute(project_id)['reviewed_deliverables']
+        else:
+            total = 0
+        if not total:
+            return {'all_confirmed': False, 'total': 0, 'confirmed_count': 0}
+        confirmed_count = ProjectProgressService._participant_confirmation_count(project_id, user_id)
         return {'all_confirmed': confirmed_count == total, 'total': total, 'confirmed_count': confirmed_count}
 
     @staticmethod
     def check_and_complete_project_by_confirmation(project_id):
-        from app.models.project import Project, ProjectDeliverable
-        project = Project.query.get(project_id)
+        """
+        所有已审核交付物均被所有参与者确认后，自动将项目设为已完成
+        
+        读取项目进度计数（O(1)），比较应确认数（已审核交付物数 × 参与者数）与已收到的确认数；
+        在锁定项目行和计数行后执行，状态更新使用条件UPDATE，
+        两个并发的最终确认不会同时修改或同时遗漏。
+        :param project_id: 项目ID
+        :return: 项目是否已满足完成条件
+        """
+        project = DeliverableConfirmationService._lock_project(project_id)
         if not project:
             return False
-        deliverables = ProjectDeliverable.query.filter_by(project_id=project_id, status=ProjectDeliverable.STATUS_REVIEWED).all()
-        if not deliverables:
-            return False
-        # 获取所有参与者ID（已接受申请的用户）
-        participant_ids = [app.user_id for app in project.applications if app.status == 2]
-        for d in deliverables:
-            for user_id in participant_ids:
-                conf = DeliverableConfirmation.query.filter_by(deliverable_id=d.id, user_id=user_id, confirmed=True).first()
-                if not conf:
-                    return False
-        # 所有交付物所有参与者都确认，项目设为已完成
-        if project.status != Project.STATUS_COMPLETED:
-            project.status = Project.STATUS_COMPLETED
+        
+        progress = ProjectProgressService.get(project_id, for_update=True)
+        if progress.reviewed_deliverables == 0 or progress.confirmations_received < progress.expected_confirmations:
             db.session.commit()
+            return False
+        
+        # 所有交付物所有参与者都确认，项目设为已完成（条件更新，仅一次生效）
+        updated = Project.query.filter(
+            Project.id == project_id,
+            Project.status != Project.STATUS_COMPLETED
+        ).update({Project.status: Project.STATUS_COMPLETED}, synchronize_session='fetch')
+        db.session.commit()
+        if updated:
+            project_detail_cache.invalidate(project_id)
         return True
+
+
+class ProjectProgressService:
+    """
+    项目进度计数维护
+
+    各计数在业务操作的同一事务内通过 UPDATE ... SET col = col + :delta 原子更新，
+    读取时为O(1)。计数行缺失时（如历史项目）按源表重新计算。
+    """
+
+    @staticmethod
+    def _participant_confirmation_count(project_id, user_id, for_update=False):
+        """
+        某用户对项目已审核交付物的确认数
+        :param for_update: 是否使用加锁读（读取最新提交的数据），在维护计数的事务中使用
+        """
+        query = db.session.query(db.func.count(DeliverableConfirmation.id)).join(
+            ProjectDeliverable, ProjectDeliverable.id == DeliverableConfirmation.deliverable_id
+        ).filter(
+            DeliverableConfirmation.project_id == project_id,
+            DeliverableConfirmation.user_id == user_id,
+            DeliverableConfirmation.confirmed == True,
+            ProjectDeliverable.status == ProjectDeliverable.STATUS_REVIEWED
+        )
+        if for_update:
+            query = query.with_for_update(read=True)
+        return query.scalar()
+
+    @staticmethod
+    def _participant_confirmation_counts(participants):
+        """
+        批量统计新参与者对项目已审核交付物的确认数（加锁读）
+        :param participants: 项目ID -> 用户ID集合
+        :return: 项目ID -> 确认数
+        """
+        pairs = {(project_id, user_id) for project_id, user_ids in participants.items() for user_id in user_ids}
+        if not pairs:
+            return {}
+        rows = db.session.query(
+            DeliverableConfirmation.project_id, DeliverableConfirmation.user_id, db.func.count(DeliverableConfirmation.id)
+        ).join(
+            ProjectDeliverable, ProjectDeliverable.id == DeliverableConfirmation.deliverable_id
+        ).filter(
+            DeliverableConfirmation.project_id.in_(list(participants)),
+            DeliverableConfirmation.user_id.in_({user_id for _, user_id in pairs}),
+            DeliverableConfirmation.confirmed == True,
+            ProjectDeliverable.status == ProjectDeliverable.STATUS_REVIEWED
+        ).group_by(
+            DeliverableConfirmation.project_id, DeliverableConfirmation.user_id
+        ).with_for_update(read=True).all()
+        counts = {}
+        for project_id, user_id, count in rows:
+            if (project_id, user_id) in pairs:
+                counts[project_id] = counts.get(project_id, 0) + count
+        return counts
+
+    @staticmethod
+    def _deliverable_confirmation_count(deliverable):
+        """
+        项目参与者对某交付物的确认数
+        """
+        participant_ids = db.session.query(ProjectApplication.user_id).filter(
+            ProjectApplication.project_id == deliverable.project_id,
+            ProjectApplication.status == ProjectApplication.STATUS_APPROVED
+        )
+        return db.session.query(db.func.count(DeliverableConfirmation.id)).filter(
+            DeliverableConfirmation.deliverable_id == deliverable.id,
+            DeliverableConfirmation.confirmed == True,
+            DeliverableConfirmation.user_id.in_(participant_ids)
+        ).with_for_update(read=True).scalar()
+
+    @staticmethod
+    def is_participant(project_id, user_id, exclude_application_id=None):
+        """
+        判断用户是否为项目参与者（存在已接受的申请）
+        :param exclude_application_id: 判断时排除的申请ID
+        """
+        query = db.session.query(ProjectApplication.id).filter(
+            ProjectApplication.project_id == project_id,
+            ProjectApplication.user_id == user_id,
+            ProjectApplication.status == ProjectApplication.STATUS_APPROVED
+        )
+        if exclude_application_id is not None:
+            query = query.filter(ProjectApplication.id != exclude_application_id)
+        return query.with_for_update(read=True).first() is not None
+
+    @staticmethod
+    def compute(project_id):
+        """
+        从源表计算项目的各项计数
+        :return: 计数字典
+        """
+        participants = db.session.query(ProjectApplication.user_id.label('user_id')).filter(
+            ProjectApplication.project_id == project_id,
+            ProjectApplication.status == ProjectApplication.STATUS_APPROVED
+        ).distinct().subquery()
+
+        reviewed_deliverables = db.session.query(db.func.count(ProjectDeliverable.id)).filter(
+            ProjectDeliverable.project_id == project_id,
+            ProjectDeliverable.status == ProjectDeliverable.STATUS_REVIEWED
+        ).scalar()
+
+        participant_count = db.session.query(db.func.count(participants.c.user_id)).scalar()
+
+        confirmations_received = db.session.query(db.func.count(DeliverableConfirmation.id)).join(
+            ProjectDeliverable, ProjectDeliverable.id == DeliverableConfirmation.deliverable_id
+        ).join(
+            participants, participants.c.user_id == DeliverableConfirmation.user_id
+        ).filter(
+            DeliverableConfirmation.project_id == project_id,
+            DeliverableConfirmation.confirmed == True,
+            ProjectDeliverable.status == ProjectDeliverable.STATUS_REVIEWED
+        ).scalar()
+
+        application_counts = dict(db.session.query(
+            ProjectApplication.status, db.func.count(ProjectApplication.id)
+        ).filter(
+            ProjectApplication.project_id == project_id
+        ).group_by(ProjectApplication.status).all())
+
+        return {
+            'reviewed_deliverables': reviewed_deliverables,
+            'participants': participant_count,
+            'confirmations_received': confirmations_received,
+            'pending_applications': application_counts.get(ProjectApplication.STATUS_PENDING, 0),
+            'approved_applications': application_counts.get(ProjectApplication.STATUS_APPROVED, 0)
+        }
+
+    @staticmethod
+    def rebuild(project_id):
+        """
+        按源表重新计算并写入项目计数（不提交事务）
+        :return: ProjectProgress 对象
+        """
+        counters = ProjectProgressService.compute(project_id)
+        progress = db.session.get(ProjectProgress, project_id)
+        if progress is None:
+            progress = ProjectProgress(project_id=project_id)
+            db.session.add(progress)
+        for field, value in counters.items():
+            setattr(progress, field, value)
+        db.session.flush()
+        return progress
+
+    @staticmethod
+    def rebuild_all():
+        """
+        重新计算所有项目的计数，用于与源表对账
+        :return: 处理的项目数
+        """
+        project_ids = [row.id for row in db.session.query(Project.id).order_by(Project.id).all()]
+        for project_id in project_ids:
+            ProjectProgressService.rebuild(project_id)
+            db.session.commit()
+        # 清理已删除项目遗留的计数行
+        ProjectProgress.query.filter(~ProjectProgress.project_id.in_(db.session.query(Project.id))).delete(synchronize_session=False)
+        db.session.commit()
+        return len(project_ids)
+
+    @staticmethod
+    def adjust(project_id, **deltas):
+        """
+        原子地增减项目计数（不提交事务）
+
+        调用前需先 flush 本次业务修改：计数行不存在时按源表重建，重建结果已包含本次修改。
+        :param project_id: 项目ID
+        :param deltas: 计数字段 -> 增量
+        """
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        values = {getattr(ProjectProgress, field): getattr(ProjectProgress, field) + delta for field, delta in deltas.items()}
+        values[ProjectProgress.updated_at] = datetime.now()
+        updated = ProjectProgress.query.filter(
+            ProjectProgress.project_id == project_id
+        ).update(values, synchronize_session=False)
+        if not updated:
+            ProjectProgressService.rebuild(project_id)
+
+    @staticmethod
+    def get(project_id, for_update=False):
+        """
+        读取项目计数，计数行不存在时按源表重建
+        :param for_update: 是否加行锁读取
+        :return: ProjectProgress 对象
+        """
+        query = ProjectProgress.query.filter_by(project_id=project_id)
+        if for_update:
+            query = query.with_for_update()
+        progress = query.populate_existing().first()
+        if progress is None:
+            progress = ProjectProgressService.rebuild(project_id)
+        return progress
+
+
+JobQueue.register('project.check_completion', ProjectDeliverableService.check_and_complete_project)
+JobQueue.register('project.complete_by_confirmation', DeliverableConfirmationService.check_and_complete_project_by_confirmation)
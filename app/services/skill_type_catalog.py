@@ -0,0 +1,89 @@
+import hashlib
+import threading
+import time
+from flask import current_app
+from app import db
+from app.models.project import SkillType
+
+class SkillTypeCatalog:
+    """
+    技能类型目录的进程内缓存
+
+    技能类型几乎不变化，因此整表缓存在进程内（id -> 记录），用于技能类型列表和技能需求校验。
+    本进程内创建技能类型时立即失效；其他 worker 进程的修改通过版本号发现：
+    每隔 SKILL_TYPE_CACHE_CHECK_INTERVAL 秒查询一次 COUNT/MAX(id)/MAX(updated_at)，
+    版本号变化时重新加载，从而使多个 gunicorn worker 最终一致。
+    """
+
+    DEFAULT_CHECK_INTERVAL = 5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (版本号, ETag, 记录列表, id索引)，整体替换以保证读取一致
+        self._state = None
+        self._checked_at = 0.0
+
+    @staticmethod
+    def _fetch_version():
+        """
+        查询技能类型表的版本号，不加载记录本身
+        """
+        count, max_id, max_updated_at = db.session.query(
+            db.func.count(SkillType.id),
+            db.func.max(SkillType.id),
+            db.func.max(SkillType.updated_at)
+        ).one()
+        return f"{count}-{max_id}-{max_updated_at.isoformat() if max_updated_at else ''}"
+
+    @staticmethod
+    def _load(version):
+        items = [skill_type.to_dict() for skill_type in SkillType.query.order_by(SkillType.id).all()]
+        etag = hashlib.sha1(version.encode('utf-8')).hexdigest()
+        by_id = {item['id']: item for item in items}
+        return version, etag, items, by_id
+
+    def _current(self):
+        """
+        返回最新的缓存状态，必要时检查版本号并重新加载
+        """
+        interval = current_app.config.get('SKILL_TYPE_CACHE_CHECK_INTERVAL', self.DEFAULT_CHECK_INTERVAL)
+        state = self._state
+        if state is not None and time.monotonic() - self._checked_at < interval:
+            return state
+        with self._lock:
+            state = self._state
+            if state is not None and time.monotonic() - self._checked_at < interval:
+                return state
+            version = self._fetch_version()
+            if state is None or state[0] != version:
+                state = self._load(version)
+                self._state = state
+            self._checked_at = time.monotonic()
+            return state
+
+    def invalidate(self):
+        """
+        使缓存失效，下次访问时重新加载
+        """
+        with self._lock:
+            self._state = None
+            self._checked_at = 0.0
+
+    def get_all(self):
+        """
+        获取所有技能类型及对应的ETag
+        :return: (技能类型字典列表, ETag)
+        """
+        _, etag, items, _ = self._current()
+        return list(items), etag
+
+    def get_by_id(self, skill_type_id):
+        """
+        根据ID获取技能类型
+        :return: 技能类型字典，不存在时返回None
+        """
+        return self._current()[3].get(skill_type_id)
+
+
+# 进程级单例
+skill_type_catalog = SkillTypeCatalog()
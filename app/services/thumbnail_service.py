@@ -0,0 +1,129 @@
+import os
+import tempfile
+from flask import current_app
+from app import db
+from app.models.project import ProjectDeliverable
+from app.services.file_storage import FileStorageService
+from app.services.job_queue import JobQueue
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # 未安装 Pillow 时不生成缩略图
+    Image = None
+    ImageOps = None
+
+class ThumbnailService:
+    """
+    图片交付物的缩略图与WebP预览图生成
+
+    上传时加入后台任务（deliverable.thumbnails），不阻塞上传请求；
+    生成结果记录在 ProjectDeliverable.thumbnail_path / preview_path，
+    通过 /api/static/deliverables?deliverable_id=<id>&variant=thumb|preview 下载。
+    按内容寻址的文件以SHA-256命名派生文件，相同内容只生成一次。
+    """
+
+    # 变体名称 -> (最长边像素, WebP质量, 记录路径的字段)
+    VARIANTS = {
+        'thumb': (320, 75, 'thumbnail_path'),
+        'preview': (1280, 80, 'preview_path'),
+    }
+    IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
+
+    @staticmethod
+    def available():
+        """是否可以生成缩略图（已安装 Pillow 且未被配置关闭）"""
+        return Image is not None and current_app.config.get('THUMBNAIL_ENABLED', True)
+
+    @staticmethod
+    def is_image(deliverable):
+        """根据文件扩展名判断交付物是否为图片"""
+        name = deliverable.file_name or deliverable.file_url or ''
+        return os.path.splitext(name)[1].lower() in ThumbnailService.IMAGE_EXTENSIONS
+
+    @staticmethod
+    def source_path(deliverable):
+        """
+        交付物原文件相对于存储根目录的路径
+        :return: 相对路径，交付物没有本地文件时返回None
+        """
+        if deliverable.stored_file:
+            return deliverable.stored_file.storage_path
+        # 旧版文件：/api/static/deliverables/<project_id>/<filename>
+        prefix = '/api/static/deliverables/'
+        if deliverable.file_url and deliverable.file_url.startswith(prefix):
+            return deliverable.file_url[len(prefix):]
+        return None
+
+    @staticmethod
+    def _variant_path(deliverable, source, variant):
+        if deliverable.file_hash:
+            return FileStorageService.variant_path(deliverable.file_hash, variant)
+        return f'{os.path.splitext(source)[0]}.{variant}.webp'
+
+    @staticmethod
+    def _render(source_file, target_file, max_size, quality):
+        """
+        生成缩放后的WebP图片，先写临时文件再原子替换，避免读到写了一半的文件
+        """
+        with Image.open(source_file) as image:
+            # JPEG 在解码阶段直接按比例缩小，大图可大幅减少解码耗时和内存
+            image.draft('RGB', (max_size, max_size))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+            image.thumbnail((max_size, max_size))
+
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target_file), suffix='.webp')
+            try:
+                with os.fdopen(fd, 'wb') as tmp:
+                    image.save(tmp, 'WEBP', quality=quality, method=4)
+                os.replace(tmp_path, target_file)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+    @staticmethod
+    def generate(deliverable_id):
+        """
+        为交付物生成缩略图和预览图并记录路径（同步执行）
+        :return: 是否生成了派生文件
+        """
+        deliverable = db.session.get(ProjectDeliverable, deliverable_id)
+        if not deliverable or not ThumbnailService.is_image(deliverable):
+            return False
+        source = ThumbnailService.source_path(deliverable)
+        root = FileStorageService.storage_root()
+        if not source or not os.path.isfile(os.path.join(root, source)):
+            return False
+
+        paths = {}
+        for variant, (max_size, quality, field) in ThumbnailService.VARIANTS.items():
+            path = ThumbnailService._variant_path(deliverable, source, variant)
+            target_file = os.path.join(root, path)
+            if not os.path.exists(target_file):
+                ThumbnailService._render(os.path.join(root, source), target_file, max_size, quality)
+            paths[field] = path
+
+        # 只更新路径字段，不修改交付物的 updated_at
+        ProjectDeliverable.query.filter_by(id=deliverable_id).update(
+            dict(paths, updated_at=ProjectDeliverable.updated_at), synchronize_session=False
+        )
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def schedule(deliverable):
+        """
+        为图片交付物加入生成缩略图的后台任务（不提交事务）
+        :return: BackgroundJob 对象，非图片或未启用时返回None
+        """
+        if not ThumbnailService.available() or not ThumbnailService.is_image(deliverable):
+            return None
+        return JobQueue.enqueue(
+            'deliverable.thumbnails',
+            {'deliverable_id': deliverable.id},
+            dedupe_key=f'deliverable.thumbnails:{deliverable.id}'
+        )
+
+
+JobQueue.register('deliverable.thumbnails', ThumbnailService.generate)
@@ -0,0 +1,237 @@
+import codecs
+import csv
+import json
+from sqlalchemy import insert, or_
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.user import User
+
+
+class UserImportService:
+    """
+    用户批量导入
+
+    逐行读取 CSV 或 NDJSON（每行一个JSON对象），不把整个文件读入内存：
+    - 每 batch_size 行为一批，逐行校验后用一次 IN 查询找出已存在的邮箱/Auth0标识，
+      文件内的重复行用集合去重；
+    - 每批有效行用一条 executemany 的 INSERT 写入并提交，与逐个调用 create_user 相比事务数从行数降为批数；
+    - 无效或重复的行不影响其他行，按行号返回错误原因。
+    """
+
+    FORMAT_CSV = 'csv'
+    FORMAT_NDJSON = 'ndjson'
+    FORMATS = (FORMAT_CSV, FORMAT_NDJSON)
+
+    DEFAULT_BATCH_SIZE = 500
+    # 报告中最多返回的错误行数，超出部分只计数
+    DEFAULT_MAX_ERRORS = 1000
+
+    # 可导入的列（与 POST /api/users 的字段一致）
+    COLUMNS = ('email', 'full_name', 'gender', 'mbti', 'star_sign', 'skills', 'interests',
+               'year_of_study', 'major', 'key_factors', 'lightning_answers', 'picture', 'user_id')
+    JSON_COLUMNS = ('key_factors', 'lightning_answers')
+
+    @staticmethod
+    def detect_format(filename=None, mimetype=None):
+        """
+        按文件扩展名或内容类型判断导入格式
+        :return: 'csv'、'ndjson' 或 None
+        """
+        if filename:
+            extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+            if extension == 'csv':
+                return UserImportService.FORMAT_CSV
+            if extension in ('ndjson', 'jsonl'):
+                return UserImportService.FORMAT_NDJSON
+        if mimetype:
+            if mimetype in ('text/csv', 'application/csv'):
+                return UserImportService.FORMAT_CSV
+            if mimetype in ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/x-jsonlines'):
+                return UserImportService.FORMAT_NDJSON
+        return None
+
+    @staticmethod
+    def read_rows(stream, fmt):
+        """
+        逐行读取导入数据
+        :param stream: 二进制文件流
+        :param fmt: 'csv' 或 'ndjson'
+        :return: 生成 (行号, 数据字典或None, 解析错误或None)
+        """
+        text = codecs.getreader('utf-8-sig')(stream)
+        if fmt == UserImportService.FORMAT_CSV:
+            reader = csv.DictReader(text)
+            for row in reader:
+                if None in row:
+                    yield reader.line_num, None, '列数多于表头'
+                    continue
+                yield reader.line_num, row, None
+        elif fmt == UserImportService.FORMAT_NDJSON:
+            for line_number, line in enumerate(text, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_number, None, f'JSON格式错误: {str(e)}'
+                    continue
+                if not isinstance(row, dict):
+                    yield line_number, None, '每行必须是一个JSON对象'
+                    continue
+                yield line_number, row, None
+        else:
+            raise ValueError(f"不支持的导入格式，可选值: {', '.join(UserImportService.FORMATS)}")
+
+    @staticmethod
+    def _validate(row):
+        """
+        校验并规范化一行数据
+        :return: 可直接插入 users 表的字典
+        """
+        values = {}
+        for column in UserImportService.COLUMNS:
+            value = row.get(column)
+            if isinstance(value, str):
+                value = value.strip()
+            if value == '' or value is None:
+                values[column] = None
+                continue
+            if column in UserImportService.JSON_COLUMNS:
+                # 与 User.set_key_factors / set_lightning_answers 一致：对象存为JSON，字符串原样保存
+                values[column] = json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+                continue
+            if isinstance(value, (dict, list)):
+                raise ValueError(f'{column}必须为字符串')
+            value = str(value)
+            length = getattr(User.__table__.c[column].type, 'length', None)
+            if length and len(value) > length:
+                raise ValueError(f'{column}长度不能超过{length}')
+            values[column] = value
+
+        if not values['email']:
+            raise ValueError('邮箱是必填字段')
+        if '@' not in values['email']:
+            raise ValueError(f"邮箱格式错误: {values['email']}")
+        if not values['user_id']:
+            raise ValueError('user_id是必填字段')
+        return values
+
+    @staticmethod
+    def import_rows(rows, batch_size=None, dry_run=False, max_errors=None, on_error=None):
+        """
+        导入用户
+        :param rows: read_rows 生成的 (行号, 数据字典, 解析错误) 序列
+        :param batch_size: 每批插入的行数
+        :param dry_run: 只校验不写入
+        :param max_errors: 报告中最多返回的错误行数
+        :param on_error: 每个失败行的回调，参数为错误字典 {"line", "email", "error"}
+        :return: 导入报告字典
+        """
+        batch_size = batch_size or UserImportService.DEFAULT_BATCH_SIZE
+        if max_errors is None:
+            max_errors = UserImportService.DEFAULT_MAX_ERRORS
+        report = {'total': 0, 'created': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+
+        def fail(line_number, error, email=None):
+            item = {'line': line_number, 'email': email, 'error': error}
+            report['failed'] += 1
+            if len(report['errors']) < max_errors:
+                report['errors'].append(item)
+            else:
+                report['errors_truncated'] = True
+            if on_error:
+                on_error(item)
+
+        # 文件内已出现的邮箱（不区分大小写）与Auth0标识
+        seen_emails = set()
+        seen_user_ids = set()
+        batch = []
+        for line_number, row, error in rows:
+            report['total'] += 1
+            if error:
+                fail(line_number, error)
+                continue
+            try:
+                values = UserImportService._validate(row)
+            except ValueError as e:
+                fail(line_number, str(e), row.get('email') if isinstance(row.get('email'), str) else None)
+                continue
+
+            email_key = values['email'].lower()
+            if email_key in seen_emails:
+                fail(line_number, f"邮箱 {values['email']} 在导入文件中重复", values['email'])
+                continue
+            if values['user_id'] in seen_user_ids:
+                fail(line_number, f"user_id {values['user_id']} 在导入文件中重复", values['email'])
+                continue
+            seen_emails.add(email_key)
+            seen_user_ids.add(values['user_id'])
+
+            batch.append((line_number, values))
+            if len(batch) >= batch_size:
+                UserImportService._flush(batch, report, fail, dry_run)
+                batch = []
+        if batch:
+            UserImportService._flush(batch, report, fail, dry_run)
+        return report
+
+    @staticmethod
+    def _flush(batch, report, fail, dry_run):
+        """
+        排除已存在的用户后批量插入一批数据并提交
+        """
+        emails = [values['email'] for _, values in batch]
+        user_ids = [values['user_id'] for _, values in batch]
+        existing_emails = set()
+        existing_user_ids = set()
+        # 直接按列比较以使用唯一索引（MySQL默认排序规则不区分大小写），结果在内存中按小写比较
+        for email, user_id in db.session.query(User.email, User.user_id).filter(
+            or_(User.email.in_(emails), User.user_id.in_(user_ids))
+        ):
+            existing_emails.add(email.lower())
+            existing_user_ids.add(user_id)
+
+        pending = []
+        for line_number, values in batch:
+            if values['email'].lower() in existing_emails:
+                fail(line_number, f"邮箱 {values['email']} 已被注册", values['email'])
+            elif values['user_id'] in existing_user_ids:
+                fail(line_number, f"user_id {values['user_id']} 已存在", values['email'])
+            else:
+                pending.append((line_number, values))
+        if not pending:
+            return
+        if dry_run:
+            report['created'] += len(pending)
+            return
+
+        try:
+            db.session.execute(insert(User.__table__), [values for _, values in pending])
+            db.session.commit()
+            report['created'] += len(pending)
+        except IntegrityError:
+            # 查询之后其他请求插入了相同的用户：逐行重试，定位冲突的行
+            db.session.rollback()
+            for line_number, values in pending:
+                try:
+                    with db.session.begin_nested():
+                        db.session.execute(insert(User.__table__), values)
+                    report['created'] += 1
+                except IntegrityError:
+                    fail(line_number, f"邮箱 {values['email']} 或 user_id {values['user_id']} 已存在", values['email'])
+            db.session.commit()
+
+    @staticmethod
+    def import_stream(stream, fmt, batch_size=None, dry_run=False, max_errors=None, on_error=None):
+        """
+        从文件流导入用户
+        :param stream: 二进制文件流
+        :param fmt: 'csv' 或 'ndjson'
+        :return: 导入报告字典（其余参数见 import_rows）
+        """
+        if fmt not in UserImportService.FORMATS:
+            raise ValueError(f"不支持的导入格式，可选值: {', '.join(UserImportService.FORMATS)}")
+        return UserImportService.import_rows(
+            UserImportService.read_rows(stream, fmt),
+            batch_size=batch_size, dry_run=dry_run, max_errors=max_errors, on_error=on_error
+        )
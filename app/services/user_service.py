@@ -1,9 +1,13 @@
 from app import db
 from app.models.project import ProjectApplication, Project, SkillType
 from app.models.user import User
+from app.services.list_reader import ListReader
 from sqlalchemy import or_
 
 class UserService:
+    # 参与者列表在用户字段之外额外返回的字段
+    PARTICIPANT_FIELDS = ('project_name', 'project_skill')
+    
     @staticmethod
     def create_user(data):
         """
@@ -73,10 +77,11 @@ class UserService:
         return User.query.filter_by(user_id=auth_id).first()
     
     @staticmethod
-    def get_user_list(filters=None):
+    def get_user_list(filters=None, fields=None):
         """
         获取用户列表，支持过滤条件
         :param filters: 过滤条件字典
+        :param fields: 只返回的字段，为None时返回全部字段
         :return: 用户列表
         """
         query = User.query
@@ -110,15 +115,15 @@ class UserService:
             if 'user_id' in filters and filters['user_id']:
                 query = query.filter(User.user_id == filters['user_id'])
         
-        # 返回用户列表
-        users = query.all()
-        return [user.to_dict() for user in users] 
+        # 返回用户列表（只读列查询，不加载ORM实体）
+        return [user.to_dict(fields) for user in ListReader.users(query, fields)]
     
     @staticmethod
-    def get_participant_user_list(filters=None):
+    def get_participant_user_list(filters=None, fields=None):
         """
         获取参与者用户列表，支持过滤条件
         :param filters: 过滤条件字典
+        :param fields: 只返回的字段（可包含 PARTICIPANT_FIELDS），为None时返回全部字段
         :return: 用户列表（包含项目名称和项目技能）
         """
         query = User.query
@@ -164,36 +169,36 @@ class UserService:
             if 'user_id' in filters and filters['user_id']:
                 query = query.filter(User.user_id == filters['user_id'])
         
-        # 获取用户列表
-        users = query.all()
-        result = []
+        user_fields = None
+        if fields is not None:
+            user_fields = tuple(field for field in fields if field in User.FIELD_COLUMNS)
+        
+        # 获取用户列表（只读列查询，不加载ORM实体）
+        users = ListReader.users(query, user_fields, 'user_id')
+        
+        # 如果指定了项目ID，一次查询出项目名称和各参与者在项目中的技能
+        project_name = None
+        skills = {}
+        if project_id and users:
+            project = db.session.query(Project.name).filter(Project.id == project_id).first()
+            project_name = project.name if project else '未知项目'
+            rows = db.session.query(ProjectApplication.user_id, SkillType.name).outerjoin(
+                SkillType, SkillType.id == ProjectApplication.skill_type_id
+            ).filter(
+                ProjectApplication.project_id == project_id,
+                ProjectApplication.status == ProjectApplication.STATUS_APPROVED
+            ).order_by(ProjectApplication.id)
+            for applicant_id, skill_name in rows:
+                skills.setdefault(applicant_id, skill_name or '未知技能')
         
+        result = []
         for user in users:
-            user_data = user.to_dict()
+            user_data = user.to_dict(user_fields)
             
-            # 如果指定了项目ID，查询该用户在项目中的技能和项目名称
             if project_id:
-                # 查询用户在该项目的申请
-                application = ProjectApplication.query.filter_by(
-                    project_id=project_id,
-                    user_id=user.user_id,
-                    status=ProjectApplication.STATUS_APPROVED
-                ).first()
-                
-                if application:
-                    # 获取项目名称
-                    project = Project.query.get(project_id)
-                    if project:
-                        user_data['project_name'] = project.name
-                    else:
-                        user_data['project_name'] = '未知项目'
-                    
-                    # 获取技能类型名称
-                    skill_type = SkillType.query.get(application.skill_type_id)
-                    if skill_type:
-                        user_data['project_skill'] = skill_type.name
-                    else:
-                        user_data['project_skill'] = '未知技能'
+                if user.user_id in skills:
+                    user_data['project_name'] = project_name
+                    user_data['project_skill'] = skills[user.user_id]
                 else:
                     user_data['project_name'] = '未知项目'
                     user_data['project_skill'] = '未知技能'
@@ -201,6 +206,11 @@ class UserService:
                 # 如果没有指定项目ID，这些字段设为空
                 user_data['project_name'] = ''
                 user_data['project_skill'] = ''
+            
+            if fields is not None:
+                for field in UserService.PARTICIPANT_FIELDS:
+                    if field not in fields:
+                        del user_data[field]
                 
             result.append(user_data)
         
@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # 未安装 redis 时只能使用进程内缓存
+    redis = None
+
+
+class LRUCache:
+    """
+    进程内LRU缓存，条目超过 max_entries 时淘汰最久未访问的条目，超过TTL的条目在读取时丢弃
+    缓存的对象直接返回给调用方，调用方不应修改
+    """
+
+    def __init__(self, max_entries=1000, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        :return: 缓存的值，不存在或已过期时返回None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisCache:
+    """
+    基于 Redis 协议服务器的共享缓存，多个 worker 进程共享同一份缓存和失效操作
+    值以JSON存储；url 可指向任何兼容 Redis 协议的服务（如本地开发时的替代实现）
+    """
+
+    def __init__(self, url, prefix='thehive:', ttl=60):
+        if redis is None:
+            raise RuntimeError('使用 Redis 缓存需要安装 redis 包')
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, json.dumps(value, ensure_ascii=False), ex=ttl or self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self):
+        return sum(1 for _ in self.client.scan_iter(match=self.prefix + '*'))
+
+
+def create_cache(config, name):
+    """
+    根据配置创建缓存后端
+    :param config: 应用配置
+    :param name: 配置前缀，如 PROJECT_CACHE 对应 PROJECT_CACHE_BACKEND、PROJECT_CACHE_TTL 等
+    :return: 缓存对象，配置为 none 时返回None（不缓存）
+    """
+    backend = (config.get(f'{name}_BACKEND') or 'memory').lower()
+    ttl = config.get(f'{name}_TTL', 60)
+    if backend == 'none':
+        return None
+    if backend == 'memory':
+        return LRUCache(max_entries=config.get(f'{name}_MAX_ENTRIES', 1000), ttl=ttl)
+    if backend == 'redis':
+        return RedisCache(config[f'{name}_REDIS_URL'], prefix=f'thehive:{name.lower()}:', ttl=ttl)
+    raise ValueError(f'不支持的缓存后端: {backend}')
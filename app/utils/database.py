@@ -0,0 +1,31 @@
+import sqlite3
+from app import db
+
+
+def supports_window_functions():
+    """
+    判断当前数据库是否支持窗口函数（MySQL 8.0+、MariaDB 10.2+、SQLite 3.25+）
+    """
+    dialect = db.engine.dialect
+    version = dialect.server_version_info or ()
+    if dialect.name == 'mysql':
+        if getattr(dialect, 'is_mariadb', False):
+            return version >= (10, 2)
+        return version >= (8, 0)
+    if dialect.name == 'sqlite':
+        return sqlite3.sqlite_version_info >= (3, 25, 0)
+    return True
+
+
+def supports_skip_locked():
+    """
+    判断当前数据库是否支持 SELECT ... FOR UPDATE SKIP LOCKED（MySQL 8.0.1+、MariaDB 10.6+）
+    SQLite 不支持行锁，FOR UPDATE 子句会被忽略
+    """
+    dialect = db.engine.dialect
+    version = dialect.server_version_info or ()
+    if dialect.name == 'mysql':
+        if getattr(dialect, 'is_mariadb', False):
+            return version >= (10, 6)
+        return version >= (8, 0, 1)
+    return dialect.name == 'postgresql'
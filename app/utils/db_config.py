@@ -0,0 +1,84 @@
+import os
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from app.utils.pool_stats import InstrumentedQueuePool
+
+
+def load_config(app, config=None):
+    """
+    按优先级加载配置（后者覆盖前者）：
+    create_app 中的默认配置 < 实例目录的 config.py < FLASK_ 前缀的环境变量（值按JSON解析，如 FLASK_DB_POOL_SIZE=20）
+    < DATABASE_URL 环境变量 < create_app 传入的配置字典
+    :param app: Flask应用
+    :param config: create_app 传入的配置字典
+    """
+    app.config.from_pyfile('config.py', silent=True)
+    app.config.from_prefixed_env()
+    if os.environ.get('DATABASE_URL'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ['DATABASE_URL']
+    if config:
+        app.config.update(config)
+
+
+def configure_database(app):
+    """
+    根据配置确定数据库URI和引擎参数（连接池、连接超时），写入 SQLALCHEMY_DATABASE_URI / SQLALCHEMY_ENGINE_OPTIONS
+    SQLALCHEMY_ENGINE_OPTIONS 中已显式配置的参数不会被覆盖
+    :param app: Flask应用
+    """
+    config = app.config
+    if (config.get('DATABASE_BACKEND') or '').lower() == 'sqlite' and not config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        # 本地运行模式：相对路径位于实例目录下
+        config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{config.get('SQLITE_PATH') or 'thehive.db'}"
+
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+
+    if url.get_backend_name() == 'sqlite':
+        # 内存数据库由 Flask-SQLAlchemy 使用 StaticPool，文件数据库使用默认的 QueuePool（不设置大小）
+        if url.database not in (None, '', ':memory:'):
+            options.setdefault('poolclass', InstrumentedQueuePool)
+            options.setdefault('pool_pre_ping', False)
+    else:
+        options.setdefault('poolclass', InstrumentedQueuePool)
+        options.setdefault('pool_size', config['DB_POOL_SIZE'])
+        options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+        options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+        options.setdefault('pool_recycle', config['DB_POOL_RECYCLE'])
+        options.setdefault('pool_pre_ping', config['DB_POOL_PRE_PING'])
+
+        connect_args = dict(options.get('connect_args') or {})
+        if config.get('DB_CONNECT_TIMEOUT'):
+            connect_args.setdefault('connect_timeout', config['DB_CONNECT_TIMEOUT'])
+        if url.get_backend_name() == 'mysql':
+            # MySQLdb/PyMySQL 的网络读写超时（秒），防止数据库无响应时请求线程一直阻塞
+            if config.get('DB_READ_TIMEOUT'):
+                connect_args.setdefault('read_timeout', config['DB_READ_TIMEOUT'])
+            if config.get('DB_WRITE_TIMEOUT'):
+                connect_args.setdefault('write_timeout', config['DB_WRITE_TIMEOUT'])
+        if connect_args:
+            options['connect_args'] = connect_args
+
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def create_database_if_missing(app):
+    """
+    创建配置的数据库（MySQL 执行 CREATE DATABASE IF NOT EXISTS；SQLite 在首次连接时自动创建文件）
+    :param app: Flask应用
+    :return: 数据库名称
+    """
+    url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() != 'mysql':
+        return url.database
+
+    # 连接MySQL服务器（不指定数据库），使用与应用相同的连接参数
+    connect_args = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}).get('connect_args', {})
+    engine = create_engine(url.set(database=None), connect_args=connect_args)
+    try:
+        with engine.connect() as conn:
+            name = engine.dialect.identifier_preparer.quote(url.database)
+            conn.execute(text(f"CREATE DATABASE IF NOT EXISTS {name} DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"))
+    finally:
+        engine.dispose()
+    return url.database
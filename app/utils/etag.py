@@ -0,0 +1,37 @@
+import hashlib
+from flask import request, make_response
+
+
+def weak_etag(*parts):
+    """
+    根据请求参数和数据版本信息生成ETag值
+    :param parts: 参与计算的值（需有稳定的repr）
+    :return: ETag值（不含引号和 W/ 前缀）
+    """
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def request_args_fingerprint():
+    """
+    当前请求的查询参数（排序后），相同的过滤和分页参数得到相同的结果
+    """
+    return tuple(sorted(request.args.items(multi=True)))
+
+
+def conditional_response(etag, build):
+    """
+    带弱ETag的条件响应
+    If-None-Match 与ETag匹配时直接返回304，不构建响应体
+    :param etag: weak_etag 生成的ETag值
+    :param build: 构建完整响应的函数，返回视图函数的返回值（如 (jsonify(...), 200)）
+    :return: Response
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,19 @@
+def parse_fields(args, model, extra=()):
+    """
+    解析 fields 查询参数（逗号分隔的输出字段，稀疏字段集）
+    :param args: request.args
+    :param model: 定义了 FIELD_COLUMNS（输出字段 -> 依赖的列名）的模型类
+    :param extra: 该接口额外允许的字段（不对应模型的列）
+    :return: 按模型字段顺序排列的字段元组（总是包含id），未指定时返回None
+    """
+    value = args.get('fields')
+    if value is None:
+        return None
+    requested = {field.strip() for field in value.split(',') if field.strip()}
+    allowed = list(model.FIELD_COLUMNS) + list(extra)
+    unknown = sorted(requested.difference(allowed))
+    if unknown:
+        raise ValueError(f"不支持的字段: {', '.join(unknown)}，可选值: {', '.join(allowed)}")
+    requested.add('id')
+    return tuple(field for field in allowed if field in requested)
+
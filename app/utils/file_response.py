@@ -0,0 +1,81 @@
+import mimetypes
+import os
+from datetime import datetime, timezone
+from urllib.parse import quote
+from flask import current_app, request, send_file, make_response
+from werkzeug.exceptions import NotFound
+from werkzeug.http import is_resource_modified
+from werkzeug.security import safe_join
+
+# 内容不可变文件的缓存时长（一年）
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+SENDFILE_MODE_X_SENDFILE = 'x-sendfile'
+SENDFILE_MODE_X_ACCEL = 'x-accel-redirect'
+
+
+def _file_etag(path):
+    """根据文件修改时间和大小生成ETag"""
+    stat = os.stat(path)
+    return f'{int(stat.st_mtime)}-{stat.st_size}'
+
+
+def _offload_response(path, relative_path, etag, download_name, mode):
+    """
+    生成交由前端代理发送文件内容的响应（零拷贝，不经过Python），Range 请求由代理处理
+    - x-sendfile: Apache mod_xsendfile / lighttpd，使用文件绝对路径
+    - x-accel-redirect: Nginx，使用 DELIVERABLE_ACCEL_PREFIX + 相对存储根目录的路径
+    """
+    last_modified = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+    # 与 send_file 相同：有 If-None-Match 时按ETag判断，否则按 If-Modified-Since 判断
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        return response
+
+    response = make_response('', 200)
+    if mode == SENDFILE_MODE_X_ACCEL:
+        prefix = current_app.config.get('DELIVERABLE_ACCEL_PREFIX', '/protected/deliverables/')
+        response.headers['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + relative_path.replace(os.sep, '/')
+    else:
+        response.headers['X-Sendfile'] = path
+
+    response.headers['Content-Type'] = mimetypes.guess_type(download_name or path)[0] or 'application/octet-stream'
+    if download_name:
+        response.headers['Content-Disposition'] = f"inline; filename*=UTF-8''{quote(download_name, safe='')}"
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    return response
+
+
+def send_stored_file(root, relative_path, etag=None, immutable=False, download_name=None):
+    """
+    发送文件，支持条件请求（ETag/Last-Modified -> 304）和 Range 请求（206）
+
+    配置 DELIVERABLE_SENDFILE_MODE 为 x-sendfile 或 x-accel-redirect 时，
+    由前端代理直接发送文件内容。
+    :param root: 存储根目录
+    :param relative_path: 相对于存储根目录的文件路径
+    :param etag: 文件的强ETag（如内容哈希），为None时由文件修改时间和大小生成
+    :param immutable: 文件内容是否不可变（按内容寻址），不可变时使用长期缓存
+    :param download_name: 下载文件名
+    :return: Response
+    """
+    path = safe_join(root, relative_path)
+    if path is None or not os.path.isfile(path):
+        raise NotFound()
+
+    mode = current_app.config.get('DELIVERABLE_SENDFILE_MODE')
+    if mode in (SENDFILE_MODE_X_SENDFILE, SENDFILE_MODE_X_ACCEL):
+        response = _offload_response(path, relative_path, etag or _file_etag(path), download_name, mode)
+    else:
+        # send_file 负责 If-None-Match/If-Modified-Since 与 Range 处理
+        response = send_file(path, download_name=download_name, conditional=True, etag=etag or True)
+    response.headers['Accept-Ranges'] = 'bytes'
+
+    if immutable:
+        response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
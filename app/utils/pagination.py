@@ -0,0 +1,189 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import or_, and_, select, func, Select
+from sqlalchemy.engine import Row
+from app import db
+
+# 默认每页数量与最大每页数量
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class KeysetPaginator:
+    """
+    基于 (排序键, id) 的游标分页
+
+    游标为不透明的 base64 字符串，内容为上一页最后一行的排序键值与id，
+    下一页通过 WHERE (sort_key, id) < (:value, :id) 定位，不依赖 OFFSET，
+    因此翻页耗时不会随数据量增长。
+    """
+
+    def __init__(self, model, sort_keys, default_sort='created_at', default_order='desc'):
+        """
+        :param model: 需要分页的模型类
+        :param sort_keys: 允许的排序键名称 -> 列 的字典，值为None表示由查询时计算的表达式（如相关度）
+        :param default_sort: 默认排序键
+        :param default_order: 默认排序方向
+        """
+        self.model = model
+        self.sort_keys = sort_keys
+        self.default_sort = default_sort
+        self.default_order = default_order
+
+    def parse_args(self, args):
+        """
+        从URL查询参数中解析分页参数
+        :param args: request.args
+        :return: 分页参数字典
+        """
+        try:
+            limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+        except (TypeError, ValueError):
+            raise ValueError('limit参数必须为整数')
+        if limit < 1:
+            raise ValueError('limit参数必须大于0')
+
+        sort = args.get('sort', self.default_sort)
+        if sort not in self.sort_keys:
+            raise ValueError(f"不支持的排序字段: {sort}，可选值: {', '.join(self.sort_keys)}")
+
+        order = args.get('order', self.default_order).lower()
+        if order not in ('asc', 'desc'):
+            raise ValueError('order参数必须为asc或desc')
+
+        pagination = {
+            'limit': min(limit, MAX_PAGE_SIZE),
+            'sort': sort,
+            'order': order,
+            'cursor': None,
+            'with_total': args.get('with_total') in ('1', 'true', 'True')
+        }
+
+        cursor = args.get('cursor')
+        if cursor:
+            pagination['cursor'] = self.decode_cursor(cursor, sort, order)
+        return pagination
+
+    def _entity(self, row):
+        """
+        取出结果行中的模型对象（查询可能附带额外的列，如LEFT JOIN得到的确认状态）；
+        row_factory 构造的只读对象直接返回
+        """
+        return row[0] if isinstance(row, (Row, tuple)) else row
+
+    def encode_cursor(self, row, sort, order, value=None):
+        """
+        根据最后一行生成游标
+        """
+        entity = self._entity(row)
+        if value is None:
+            value = getattr(entity, sort)
+        if isinstance(value, datetime):
+            value = {'dt': value.isoformat()}
+        payload = json.dumps({'s': sort, 'o': order, 'v': value, 'id': entity.id}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor, sort, order):
+        """
+        解析游标，游标须与当前排序方式一致
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            value = payload['v']
+            if isinstance(value, dict) and 'dt' in value:
+                value = datetime.fromisoformat(value['dt'])
+            last_id = int(payload['id'])
+        except Exception:
+            raise ValueError('cursor参数无效')
+
+        if payload.get('s') != sort or payload.get('o') != order:
+            raise ValueError('cursor与当前排序方式不匹配')
+        return {'value': value, 'id': last_id}
+
+    @staticmethod
+    def _fetch(query, params=None, entities=False):
+        """
+        执行查询，支持 ORM Query 和带绑定参数的 2.0 select 语句
+        :param entities: select 语句只查询模型时返回模型对象而不是结果行
+        """
+        if not isinstance(query, Select):
+            return query.all()
+        result = db.session.execute(query, params or {})
+        return result.scalars().all() if entities else result.all()
+
+    @staticmethod
+    def _count(query, params=None):
+        if not isinstance(query, Select):
+            return query.order_by(None).count()
+        return db.session.scalar(select(func.count()).select_from(query.order_by(None).subquery()), params or {})
+
+    def paginate(self, query, pagination, computed_keys=None, row_factory=None, params=None):
+        """
+        对查询应用游标分页
+        :param query: 已应用过滤条件的查询（ORM Query 或 select 语句）
+        :param pagination: parse_args 返回的分页参数字典，为None时返回全部结果
+        :param computed_keys: 查询时计算的排序表达式，如全文检索的相关度
+        :param row_factory: 将列查询的结果行转换为对象的函数（对象须有id和排序键属性），为None时查询返回模型对象
+        :param params: select 语句的绑定参数
+        :return: (当前页对象列表, 下一页游标, 总数或None)
+        """
+        if not pagination:
+            if row_factory:
+                return [row_factory(row) for row in self._fetch(query, params)], None, None
+            return self._fetch(query, params, entities=True), None, None
+
+        total = None
+        if pagination.get('with_total'):
+            # 单独执行COUNT，仅在调用方显式请求时执行
+            total = self._count(query, params)
+
+        sort = pagination['sort']
+        sort_column = self.sort_keys[sort]
+        computed = sort_column is None
+        if computed:
+            sort_column = (computed_keys or {}).get(sort)
+            if sort_column is None:
+                raise ValueError(f'当前查询不支持按 {sort} 排序')
+            query = query.add_columns(sort_column)
+        id_column = self.model.id
+        descending = pagination['order'] == 'desc'
+
+        cursor = pagination.get('cursor')
+        if cursor:
+            if descending:
+                query = query.filter(or_(
+                    sort_column < cursor['value'],
+                    and_(sort_column == cursor['value'], id_column < cursor['id'])
+                ))
+            else:
+                query = query.filter(or_(
+                    sort_column > cursor['value'],
+                    and_(sort_column == cursor['value'], id_column > cursor['id'])
+                ))
+
+        if descending:
+            query = query.order_by(sort_column.desc(), id_column.desc())
+        else:
+            query = query.order_by(sort_column.asc(), id_column.asc())
+
+        # 多取一行用于判断是否还有下一页
+        limit = pagination['limit']
+        rows = self._fetch(query.limit(limit + 1), params, entities=not computed and not row_factory)
+
+        next_cursor = None
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if computed:
+            # 去掉追加在末尾的排序值列
+            values = [row[-1] for row in rows]
+            if not row_factory:
+                rows = [row[0] if len(row) == 2 else tuple(row[:-1]) for row in rows]
+        if row_factory:
+            rows = [row_factory(row) for row in rows]
+        if has_more:
+            last_value = values[-1] if computed else None
+            next_cursor = self.encode_cursor(rows[-1], sort, pagination['order'], last_value)
+
+        return rows, next_cursor, total
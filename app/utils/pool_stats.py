@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """
+    数据库连接池统计
+
+    记录每次从连接池取得连接的等待时间（按毫秒分桶的直方图，包含池未满时新建连接的耗时）和等待超时次数，
+    与连接池当前的占用情况一起返回，用于按 worker 数量和并发确定 DB_POOL_SIZE / DB_MAX_OVERFLOW：
+    等待时间长或出现超时说明连接池不足，checked_in 长期较多说明连接池过大。
+    """
+
+    # 等待时间直方图的桶上限（毫秒），最后一个桶为超过最大上限的次数
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record_wait(self, seconds):
+        milliseconds = seconds * 1000
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            for index, bound in enumerate(self.BUCKETS_MS):
+                if milliseconds <= bound:
+                    self.buckets[index] += 1
+                    break
+            else:
+                self.buckets[-1] += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self, engine):
+        """
+        :param engine: 数据库引擎
+        :return: 连接池占用情况与等待时间统计的字典
+        """
+        pool = engine.pool
+        histogram = {f'<={bound}ms': count for bound, count in zip(self.BUCKETS_MS, self.buckets)}
+        histogram[f'>{self.BUCKETS_MS[-1]}ms'] = self.buckets[-1]
+        data = {
+            'pid': os.getpid(),
+            'pool_class': type(pool).__name__,
+            'status': pool.status()
+        }
+        if isinstance(pool, QueuePool):
+            data.update({
+                'pool_size': pool.size(),
+                'max_overflow': pool._max_overflow,
+                'timeout': pool.timeout(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                # 超出 pool_size 的连接数；池中连接尚未全部建立时为负数
+                'overflow': pool.overflow()
+            })
+        data['wait'] = {
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'avg_ms': round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else None,
+            'max_ms': round(self.max_wait * 1000, 3),
+            'histogram': histogram
+        }
+        return data
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+            self.buckets = [0] * (len(self.BUCKETS_MS) + 1)
+
+
+# 进程级单例
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    记录取得连接等待时间的 QueuePool，通过 SQLALCHEMY_ENGINE_OPTIONS 的 poolclass 启用
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            pool_stats.record_timeout()
+            raise
+        pool_stats.record_wait(time.perf_counter() - start)
+        return connection
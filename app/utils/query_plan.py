@@ -0,0 +1,74 @@
+import re
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import db
+
+
+@contextmanager
+def capture_statements():
+    """
+    记录代码块中执行的 SELECT 语句及其参数
+    :return: [(语句, 参数)] 列表，代码块结束后填充完毕
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def _explain_mysql(connection, statement, parameters):
+    plan = []
+    for row in connection.exec_driver_sql('EXPLAIN ' + statement, parameters).mappings():
+        if not row['table']:
+            continue
+        plan.append({
+            'table': row['table'],
+            'index': row['key'],
+            'full_scan': row['type'] == 'ALL',
+            'detail': f"type={row['type']} rows={row['rows']} {row['Extra'] or ''}".strip()
+        })
+    return plan
+
+
+def _explain_sqlite(connection, statement, parameters):
+    plan = []
+    for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters):
+        detail = row[3]
+        words = detail.split()
+        if len(words) < 2 or words[0] not in ('SCAN', 'SEARCH'):
+            continue
+        if 'USING INTEGER PRIMARY KEY' in detail:
+            index = 'PRIMARY'
+        else:
+            match = re.search(r'USING (?:COVERING )?INDEX (\S+)', detail)
+            index = match.group(1) if match else None
+        plan.append({
+            'table': words[1],
+            'index': index,
+            'full_scan': words[0] == 'SCAN' and index is None,
+            'detail': detail
+        })
+    return plan
+
+
+def explain(statement, parameters=None):
+    """
+    获取语句的执行计划，在当前会话的连接上执行（可以看到未提交的数据）
+    :param statement: 驱动层SQL语句
+    :param parameters: 驱动层参数
+    :return: 每个表的访问方式列表 [{'table', 'index', 'full_scan', 'detail'}]
+    """
+    connection = db.session.connection()
+    dialect = db.engine.dialect.name
+    if dialect == 'mysql':
+        return _explain_mysql(connection, statement, parameters or ())
+    if dialect == 'sqlite':
+        return _explain_sqlite(connection, statement, parameters or ())
+    raise ValueError(f'不支持的数据库: {dialect}')
@@ -0,0 +1,56 @@
+import threading
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+
+class StatementCacheStats:
+    """
+    SQLAlchemy 编译语句缓存的命中统计
+
+    每次执行语句后读取执行上下文的 cache_hit：结构相同的语句（绑定参数值不同）复用已编译的SQL时为命中；
+    文本SQL、DDL等不参与缓存的语句单独计数，不计入命中率。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def install(self):
+        """
+        为所有引擎注册统计监听（重复调用只注册一次）
+        """
+        if not event.contains(Engine, 'after_cursor_execute', self._after_cursor_execute):
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        cache_hit = getattr(context, 'cache_hit', None)
+        with self._lock:
+            if cache_hit is CACHE_HIT:
+                self.hits += 1
+            elif cache_hit is CACHE_MISS:
+                self.misses += 1
+            else:
+                self.uncached += 1
+
+    def stats(self):
+        """
+        :return: 包含命中数、未命中数、命中率、不参与缓存的语句数的字典
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else None,
+            'uncached': self.uncached
+        }
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = self.uncached = 0
+
+
+# 进程级单例
+statement_cache_stats = StatementCacheStats()
@@ -46,6 +46,11 @@ CREATE TABLE IF NOT EXISTS projects (
     user_id VARCHAR(100) NOT NULL COMMENT '创建者Auth0用户标识',
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    row_version INT NOT NULL DEFAULT 1 COMMENT '行版本号',
+    INDEX idx_projects_status_recruitment_type (status, recruitment_status, project_type),
+    INDEX idx_projects_user_id (user_id),
+    FULLTEXT KEY ft_projects_name (name) WITH PARSER ngram,
+    FULLTEXT KEY ft_projects_content (description, goal) WITH PARSER ngram,
     FOREIGN KEY (user_id) REFERENCES users(user_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='项目表';
 
@@ -74,11 +79,23 @@ CREATE TABLE IF NOT EXISTS project_applications (
     response_message TEXT COMMENT '回复消息',
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '申请时间',
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+    row_version INT NOT NULL DEFAULT 1 COMMENT '行版本号',
+    INDEX idx_project_applications_project_status_updated (project_id, status, updated_at),
+    INDEX idx_project_applications_user_status (user_id, status),
     FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
     FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
     FOREIGN KEY (skill_type_id) REFERENCES skill_types(id) ON DELETE RESTRICT
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='项目申请表';
 
+-- 文件存储表（按内容寻址，相同内容只存一份）
+CREATE TABLE IF NOT EXISTS stored_files (
+    sha256 CHAR(64) PRIMARY KEY COMMENT '文件内容SHA-256',
+    size BIGINT NOT NULL COMMENT '文件大小（字节）',
+    storage_path VARCHAR(255) NOT NULL COMMENT '相对于存储根目录的路径',
+    ref_count INT NOT NULL DEFAULT 1 COMMENT '引用计数',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='文件存储表';
+
 -- 项目交付物表
 CREATE TABLE IF NOT EXISTS project_deliverables (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -89,11 +106,16 @@ CREATE TABLE IF NOT EXISTS project_deliverables (
     file_name VARCHAR(255) COMMENT '文件名',
     file_size INT COMMENT '文件大小（字节）',
     link_url VARCHAR(255) COMMENT '外部链接（如为URL导入）',
+    file_hash CHAR(64) COMMENT '文件内容SHA-256',
+    thumbnail_path VARCHAR(255) COMMENT '缩略图路径（相对于存储根目录）',
+    preview_path VARCHAR(255) COMMENT 'WebP预览图路径（相对于存储根目录）',
     status TINYINT DEFAULT 0 COMMENT '交付物状态：0-草稿，1-已提交，2-已审核',
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+    INDEX idx_project_deliverables_project_created (project_id, created_at),
     FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-    FOREIGN KEY (uploader_id) REFERENCES users(user_id) ON DELETE CASCADE
+    FOREIGN KEY (uploader_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (file_hash) REFERENCES stored_files(sha256)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='项目交付物表';
 
 -- 交付物确认表
@@ -110,6 +132,36 @@ CREATE TABLE IF NOT EXISTS deliverable_confirmations (
     FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='交付物确认表';
 
+-- 项目进度计数表
+CREATE TABLE IF NOT EXISTS project_progress (
+    project_id INT PRIMARY KEY COMMENT '项目ID',
+    reviewed_deliverables INT NOT NULL DEFAULT 0 COMMENT '已审核交付物数',
+    participants INT NOT NULL DEFAULT 0 COMMENT '参与者数（已接受申请的用户，去重）',
+    confirmations_received INT NOT NULL DEFAULT 0 COMMENT '参与者对已审核交付物的确认数',
+    pending_applications INT NOT NULL DEFAULT 0 COMMENT '待处理申请数',
+    approved_applications INT NOT NULL DEFAULT 0 COMMENT '已接受申请数',
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='项目进度计数表';
+
+-- 后台任务表
+CREATE TABLE IF NOT EXISTS background_jobs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    job_type VARCHAR(50) NOT NULL COMMENT '任务类型',
+    payload TEXT COMMENT '任务参数，存储为JSON',
+    dedupe_key VARCHAR(191) UNIQUE COMMENT '去重键，同一键同时只存在一个未完成任务',
+    status TINYINT NOT NULL DEFAULT 0 COMMENT '任务状态：0-待执行，1-执行中，2-已完成，3-失败',
+    attempts INT NOT NULL DEFAULT 0 COMMENT '已执行次数',
+    max_attempts INT NOT NULL DEFAULT 5 COMMENT '最大执行次数',
+    run_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '最早执行时间',
+    locked_at DATETIME COMMENT '开始执行时间',
+    locked_by VARCHAR(100) COMMENT '执行者标识',
+    last_error TEXT COMMENT '最近一次错误信息',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+    INDEX idx_background_jobs_status_run_at (status, run_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='后台任务表';
+
 -- 插入初始技能类型数据
 INSERT INTO skill_types (name, description) VALUES
 ('Software Development', 'Develop various software applications, including desktop and server applications'),
@@ -0,0 +1,65 @@
+"""add indexes for hot query patterns
+
+Revision ID: 3f1c2a9b7d40
+Revises:
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9b7d40'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (表名, 索引名, 列)
+INDEXES = [
+    ('projects', 'idx_projects_status_recruitment_type', ['status', 'recruitment_status', 'project_type']),
+    ('projects', 'idx_projects_user_id', ['user_id']),
+    ('project_applications', 'idx_project_applications_project_status_updated', ['project_id', 'status', 'updated_at']),
+    ('project_applications', 'idx_project_applications_user_status', ['user_id', 'status']),
+    ('project_deliverables', 'idx_project_deliverables_project_created', ['project_id', 'created_at']),
+]
+
+
+def _existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def _ensure_foreign_key_index(table, column, dropping):
+    """
+    MySQL 要求外键列上有索引：新建以外键列开头的索引后，InnoDB 会删除自动创建的外键索引，
+    因此删除这些索引前先确保该列还有其他索引可用
+    """
+    inspector = sa.inspect(op.get_bind())
+    foreign_key_columns = {fk['constrained_columns'][0] for fk in inspector.get_foreign_keys(table)}
+    if column not in foreign_key_columns:
+        return
+    for index in inspector.get_indexes(table):
+        if index['name'] != dropping and index['column_names'][:1] == [column]:
+            return
+    op.create_index(f'idx_{table}_{column}_fk', table, [column])
+
+
+def upgrade():
+    for table, name, columns in INDEXES:
+        # 已通过 database.sql 或 db.create_all() 建好索引的数据库跳过
+        if name in _existing_indexes(table):
+            continue
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(name, columns, unique=False)
+
+
+def downgrade():
+    is_mysql = op.get_bind().dialect.name == 'mysql'
+    for table, name, columns in reversed(INDEXES):
+        if name not in _existing_indexes(table):
+            continue
+        if is_mysql:
+            _ensure_foreign_key_index(table, columns[0], name)
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(name)
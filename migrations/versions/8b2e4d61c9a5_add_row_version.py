@@ -0,0 +1,40 @@
+"""add row_version to projects and project_applications
+
+Revision ID: 8b2e4d61c9a5
+Revises: 3f1c2a9b7d40
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d61c9a5'
+down_revision = '3f1c2a9b7d40'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ('projects', 'project_applications')
+
+
+def _existing_columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    for table in TABLES:
+        # 已通过 database.sql 或 db.create_all() 建好列的数据库跳过
+        if 'row_version' in _existing_columns(table):
+            continue
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('row_version', sa.Integer(), nullable=False, server_default='1', comment='行版本号'))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        if 'row_version' not in _existing_columns(table):
+            continue
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('row_version')
@@ -0,0 +1,64 @@
+"""add stored_files and project_deliverables.file_hash
+
+Revision ID: c47a1e93b2f0
+Revises: 8b2e4d61c9a5
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47a1e93b2f0'
+down_revision = '8b2e4d61c9a5'
+branch_labels = None
+depends_on = None
+
+
+FOREIGN_KEY = 'fk_project_deliverables_file_hash'
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _existing_columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _file_hash_foreign_keys():
+    return [
+        fk['name'] for fk in sa.inspect(op.get_bind()).get_foreign_keys('project_deliverables')
+        if fk['constrained_columns'] == ['file_hash']
+    ]
+
+
+def upgrade():
+    # 已通过 database.sql 或 db.create_all() 建好表和列的数据库跳过
+    if 'stored_files' not in _existing_tables():
+        op.create_table(
+            'stored_files',
+            sa.Column('sha256', sa.String(64), primary_key=True, comment='文件内容SHA-256'),
+            sa.Column('size', sa.BigInteger(), nullable=False, comment='文件大小（字节）'),
+            sa.Column('storage_path', sa.String(255), nullable=False, comment='相对于存储根目录的路径'),
+            sa.Column('ref_count', sa.Integer(), nullable=False, server_default='1', comment='引用计数'),
+            sa.Column('created_at', sa.DateTime(), nullable=True, comment='创建时间')
+        )
+
+    if 'file_hash' not in _existing_columns('project_deliverables'):
+        with op.batch_alter_table('project_deliverables', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('file_hash', sa.String(64), nullable=True, comment='文件内容SHA-256'))
+            batch_op.create_foreign_key(FOREIGN_KEY, 'stored_files', ['file_hash'], ['sha256'])
+
+
+def downgrade():
+    if 'file_hash' in _existing_columns('project_deliverables'):
+        with op.batch_alter_table('project_deliverables', schema=None) as batch_op:
+            for name in _file_hash_foreign_keys():
+                if name:
+                    batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.drop_column('file_hash')
+
+    if 'stored_files' in _existing_tables():
+        op.drop_table('stored_files')
@@ -0,0 +1,46 @@
+"""add thumbnail_path and preview_path to project_deliverables
+
+Revision ID: d5f08b6e7a12
+Revises: c47a1e93b2f0
+Create Date: 2026-10-18 20:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f08b6e7a12'
+down_revision = 'c47a1e93b2f0'
+branch_labels = None
+depends_on = None
+
+
+# (列名, 注释)
+COLUMNS = [
+    ('thumbnail_path', '缩略图路径（相对于存储根目录）'),
+    ('preview_path', 'WebP预览图路径（相对于存储根目录）'),
+]
+
+
+def _existing_columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    # 已通过 database.sql 或 db.create_all() 建好列的数据库跳过
+    missing = [(name, comment) for name, comment in COLUMNS if name not in _existing_columns('project_deliverables')]
+    if not missing:
+        return
+    with op.batch_alter_table('project_deliverables', schema=None) as batch_op:
+        for name, comment in missing:
+            batch_op.add_column(sa.Column(name, sa.String(255), nullable=True, comment=comment))
+
+
+def downgrade():
+    existing = [name for name, _ in reversed(COLUMNS) if name in _existing_columns('project_deliverables')]
+    if not existing:
+        return
+    with op.batch_alter_table('project_deliverables', schema=None) as batch_op:
+        for name in existing:
+            batch_op.drop_column(name)
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+from app.models.project import Project, ProjectApplication, SkillRequirement, SkillType
+from app.models.user import User
+
+
+LIST_URLS = (
+    '/api/projects?limit=100',
+    '/api/projects/founder?user_id=founder&limit=100',
+    '/api/projects/participant?user_id=member&limit=100',
+)
+
+
+def make_app(project_count):
+    """创建使用内存 SQLite 的应用，并生成指定数量的项目（均有技能需求和已接受的申请）"""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'PROJECT_CACHE_BACKEND': 'none',
+        'TESTING': True
+    })
+    with app.app_context():
+        db.create_all()
+        for user_id in ('founder', 'member'):
+            db.session.add(User(email=f'{user_id}@example.com', user_id=user_id, full_name=user_id))
+        skill_types = [SkillType(name=name) for name in ('Web', 'AI', 'Design')]
+        db.session.add_all(skill_types)
+        db.session.flush()
+
+        base = datetime(2024, 1, 1)
+        for i in range(project_count):
+            project = Project(
+                name=f'Project {i}', project_type='course', end_time=base, description='desc', goal='goal',
+                user_id='founder', created_at=base + timedelta(minutes=i), updated_at=base + timedelta(minutes=i)
+            )
+            for skill_type in skill_types[:1 + i % 3]:
+                project.skill_requirements.append(
+                    SkillRequirement(skill_type_id=skill_type.id, required_count=1, importance=3)
+                )
+            db.session.add(project)
+            db.session.flush()
+            db.session.add(ProjectApplication(
+                project_id=project.id, user_id='member', skill_type_id=skill_types[0].id,
+                status=ProjectApplication.STATUS_APPROVED
+            ))
+        db.session.commit()
+    return app
+
+
+def count_statements(app, url):
+    """请求列表接口，返回执行的SQL语句数和返回的项目数"""
+    statements = []
+    client = app.test_client()
+    # 先请求一次，预热技能类型目录等进程级缓存
+    client.get(url)
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    assert response.status_code == 200, response.get_json()
+    return len(statements), len(response.get_json()['data'])
+
+
+@pytest.mark.parametrize('url', LIST_URLS)
+def test_statement_count_independent_of_project_count(url):
+    small_count, small_items = count_statements(make_app(5), url)
+    large_count, large_items = count_statements(make_app(50), url)
+
+    assert (small_items, large_items) == (5, 50)
+    assert small_count == large_count